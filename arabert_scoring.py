@@ -0,0 +1,167 @@
+import atexit
+import contextlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from instrumentation import stage
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre processus
+    fcntl = None
+
+
+class WordScoreCache:
+    """Cache mot -> score AraBERT, borné (LRU) et éventuellement persisté sur disque.
+
+    Avec un fichier, les scores sont sauvegardés tous les `save_every`
+    nouveaux mots et à la fin du processus. Les processus d'un pool ne
+    passent pas par atexit : ils doivent appeler `save()` eux-mêmes.
+    """
+
+    def __init__(self, max_size=50000, path=None, model_name=None, save_every=1000):
+        self.max_size = max_size
+        self.path = path
+        self.model_name = model_name
+        self.save_every = save_every
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0  # Nouveaux mots depuis la dernière sauvegarde
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def get(self, word):
+        with self._lock:
+            if word in self._scores:
+                self._scores.move_to_end(word)
+                self.hits += 1
+                return self._scores[word]
+            self.misses += 1
+            return None
+
+    def put(self, word, score):
+        with self._lock:
+            if word not in self._scores:
+                self._unsaved += 1
+            self._scores[word] = score
+            self._scores.move_to_end(word)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+            save_now = self.path and self.save_every and self._unsaved >= self.save_every
+        if save_now:
+            self.save()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def clear(self):
+        """Vide le cache en mémoire et remet les compteurs à zéro (le fichier n'est pas modifié)."""
+        with self._lock:
+            self._scores.clear()
+            self._unsaved = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _read_file(self):
+        """Scores du fichier, s'il existe et correspond au même modèle."""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("model") != self.model_name:
+            return {}
+        return data.get("scores", {})
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def load(self):
+        """Charge les scores sauvegardés, s'ils correspondent au même modèle."""
+        scores = self._read_file()
+        with self._lock:
+            for word, score in scores.items():
+                self._scores[word] = score
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+    def save(self):
+        """Fusionne les nouveaux scores avec ceux du fichier puis l'écrit (remplacement atomique).
+
+        Le fichier est verrouillé pendant la fusion (si fcntl est disponible) :
+        des processus qui partagent le cache ne s'écrasent pas mutuellement.
+        En cas de conflit, les scores en mémoire l'emportent.
+        """
+        if not self.path:
+            return
+        with self._save_lock, self._file_lock():
+            with self._lock:
+                if not self._unsaved:
+                    return
+                scores = dict(self._scores)
+                self._unsaved = 0
+            merged = {word: score for word, score in self._read_file().items() if word not in scores}
+            merged.update(scores)
+            if len(merged) > self.max_size:
+                merged = dict(list(merged.items())[-self.max_size:])
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "scores": merged}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class ArabertScorer:
+    """Calcule les scores AraBERT par lots de mots, avec un cache mot -> score.
+
+    Le score d'un mot est la moyenne de l'embedding [CLS] obtenu en encodant
+    le mot seul ; les lots sont complétés (padding) et masqués, ce qui donne
+    les mêmes scores qu'un passage par mot.
+    """
+
+    def __init__(self, model_loader, batch_size=64, cache=None):
+        self.model_loader = model_loader
+        self.batch_size = batch_size
+        self.cache = cache if cache is not None else WordScoreCache()
+
+    def score(self, words, batch_size=None):
+        """Retourne un dictionnaire mot -> score pour `words`."""
+        scores = {}
+        missing = []
+        for word in dict.fromkeys(words):
+            cached = self.cache.get(word)
+            if cached is None:
+                missing.append(word)
+            else:
+                scores[word] = cached
+
+        if missing:
+            import torch
+            tokenizer, model = self.model_loader()
+            batch_size = batch_size or self.batch_size
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start:start + batch_size]
+                with stage("arabert_tokenize"):
+                    inputs = tokenizer(batch, return_tensors="pt", truncation=True, padding=True, max_length=512)
+                with stage("arabert_forward"), torch.no_grad():
+                    outputs = model(**inputs)
+                cls_embeddings = outputs.last_hidden_state[:, 0, :]  # Embeddings [CLS] du lot
+                for word, score in zip(batch, cls_embeddings.mean(dim=1).tolist()):
+                    scores[word] = score
+                    self.cache.put(word, score)
+        return scores
+
+    def score_documents(self, documents_words, batch_size=None):
+        """Score les mots candidats de plusieurs documents en une seule série de lots."""
+        all_scores = self.score([word for words in documents_words for word in words], batch_size)
+        return [{word: all_scores[word] for word in words} for words in documents_words]
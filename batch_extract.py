@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import instrumentation
+from keyword_extraction import (BATCH_METHODS, METHODS, METHOD_MODELS, extract_keywords, extract_keywords_batch,
+                                flush_caches, load_method_models, preprocess)
+
+# Pseudo-méthode : retourne seulement le texte nettoyé sans stopwords
+CLEAN_METHOD = "Nettoyage"
+
+
+def read_documents(paths, text_field="text", id_field="id"):
+    """Lit les documents (identifiant, texte) un par un.
+
+    Les fichiers .jsonl contiennent un objet JSON par ligne ; les autres
+    fichiers contiennent un document par ligne. Une ligne JSON invalide ou
+    sans texte donne l'exception correspondante à la place du texte, afin
+    que le résultat de ce document porte l'erreur sans interrompre le lot.
+    """
+    for path in paths:
+        is_jsonl = path.endswith((".jsonl", ".ndjson"))
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                if is_jsonl:
+                    doc_id = f"{path}:{line_number}"
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        yield doc_id, e
+                        continue
+                    if not isinstance(record, dict):
+                        yield doc_id, ValueError("la ligne n'est pas un objet JSON")
+                        continue
+                    doc_id = record.get(id_field, doc_id)
+                    text = record.get(text_field)
+                    if not isinstance(text, str):
+                        text = ValueError(f"champ '{text_field}' absent ou non textuel")
+                    yield doc_id, text
+                else:
+                    yield f"{path}:{line_number}", line
+
+
+def process_documents(method, top_n, documents, trace=False):
+    """Traite une liste de documents et retourne un résultat par document.
+
+    Pour les méthodes à modèle (BATCH_METHODS), les documents valides sont
+    traités en un seul lot ; si le lot échoue, chaque document est repris
+    seul et seul le document fautif porte l'erreur. La trace d'un document
+    traité en lot est alors celle de tout le lot.
+    """
+    if method in BATCH_METHODS:
+        results = _process_batch(method, top_n, documents, trace)
+    else:
+        results = [_process_document(method, top_n, doc_id, text, trace) for doc_id, text in documents]
+    # Les processus du pool sont arrêtés sans passer par atexit
+    flush_caches()
+    return results
+
+
+def _keywords_result(doc_id, method, keywords):
+    return {"id": doc_id, "method": method, "keywords": [[keyword, float(score)] for keyword, score in keywords]}
+
+
+def _process_document(method, top_n, doc_id, text, trace):
+    result = {"id": doc_id, "method": method}
+    with instrumentation.request(method) as request_trace:
+        try:
+            if isinstance(text, Exception):
+                raise text
+            if method == CLEAN_METHOD:
+                result["text"] = preprocess(text)
+            else:
+                result = _keywords_result(doc_id, method, extract_keywords(text, method, top_n=top_n))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+    if trace and request_trace is not None:
+        result["trace"] = request_trace.to_dict()
+    return result
+
+
+def _process_batch(method, top_n, documents, trace):
+    valid = [i for i, (_, text) in enumerate(documents) if not isinstance(text, Exception)]
+    batch_keywords, batch_trace = {}, None
+    if valid:
+        with instrumentation.request(method) as request_trace:
+            try:
+                keywords = extract_keywords_batch([documents[i][1] for i in valid], method, top_n=top_n)
+                batch_keywords = dict(zip(valid, keywords))
+            except Exception:
+                pass  # Documents repris un par un ci-dessous
+        if trace and request_trace is not None:
+            batch_trace = request_trace.to_dict()
+
+    results = []
+    for i, (doc_id, text) in enumerate(documents):
+        if i not in batch_keywords:
+            results.append(_process_document(method, top_n, doc_id, text, trace))
+            continue
+        result = _keywords_result(doc_id, method, batch_keywords[i])
+        if batch_trace is not None:
+            result["trace"] = batch_trace
+        results.append(result)
+    return results
+
+
+def _init_worker(method, trace):
+    if trace:
+        instrumentation.configure(enabled=True)
+    load_method_models(method)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def extract_stream(documents, method, top_n=10, workers=None, chunk_size=32, max_in_flight=None, trace=False):
+    """Extrait les mots-clés d'un flux de documents (identifiant, texte).
+
+    Les méthodes sans modèle sont réparties sur un pool de processus ; pour
+    les méthodes avec modèle, chaque processus charge son modèle une seule
+    fois au démarrage. Au plus `max_in_flight` paquets de `chunk_size`
+    documents sont en cours à la fois, et les résultats sont produits dans
+    l'ordre d'entrée. Avec `workers=0`, tout est traité dans le processus courant.
+    Avec `trace=True`, chaque résultat contient la trace des étapes.
+    """
+    if method not in METHODS and method != CLEAN_METHOD:
+        raise ValueError(f"Méthode inconnue : {method}")
+
+    model_backed = method in METHOD_MODELS
+    if workers is None:
+        workers = 1 if model_backed else os.cpu_count() or 1
+    if workers == 0:
+        if trace:
+            instrumentation.configure(enabled=True)
+        for chunk in _chunks(documents, chunk_size):
+            yield from process_documents(method, top_n, chunk, trace)
+        return
+
+    max_in_flight = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(method, trace)) as executor:
+        pending = deque()
+        for chunk in _chunks(documents, chunk_size):
+            pending.append(executor.submit(process_documents, method, top_n, chunk, trace))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction de mots-clés par lots (JSONL ou texte brut).")
+    parser.add_argument("inputs", nargs="+", help="Fichiers .jsonl ou texte (un document par ligne)")
+    parser.add_argument("--method", required=True, choices=list(METHODS) + [CLEAN_METHOD])
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--output", "-o", default="-", help="Fichier JSONL de sortie (stdout par défaut)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus (0 : aucun ; par défaut : CPU, ou 1 pour les méthodes avec modèle)")
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--trace", action="store_true", help="Ajouter la trace des étapes à chaque résultat")
+    args = parser.parse_args()
+
+    documents = read_documents(args.inputs, text_field=args.text_field, id_field=args.id_field)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for result in extract_stream(documents, args.method, top_n=args.top_n, workers=args.workers,
+                                     chunk_size=args.chunk_size, max_in_flight=args.max_in_flight,
+                                     trace=args.trace):
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from itertools import islice
+
+from sample_texts import texts
+
+METHOD_NAMES = [
+    "YAKE",
+    "TF-IDF",
+    "KeyBERT + DistilBERT",
+    "TF-IDF + AraBERT",
+    "KeyBERT + AraBERT",
+    "KeyBERT + XLM-RoBERTa",
+    "TF-IDF + Yake + AraBERT",
+]
+
+# Corpus synthétiques : (nombre de documents, nombre de mots par document)
+SYNTHETIC_CORPORA = {
+    "paragraphe": (1, 80),
+    "courts-1k": (1000, 50),
+    "longs-100": (100, 5000),
+    "courts-100k": (100000, 50),
+    "tres-longs-10": (10, 50000),
+}
+
+PROFILES = {
+    "quick": ["sujets", "paragraphe", "courts-1k"],
+    "full": ["sujets"] + list(SYNTHETIC_CORPORA),
+}
+
+# Budget de démarrage (import et premier résultat) des méthodes sans modèle, qui ne doivent charger
+# aucune bibliothèque lourde
+STARTUP_BUDGET_MS = 500
+MODEL_FREE_METHODS = ["YAKE", "TF-IDF"]
+HEAVY_MODULES = ["torch", "transformers", "keybert", "sentence_transformers", "sklearn"]
+
+# Documents de chaque corpus repassés avec l'instrumentation pour le détail par étape
+DETAIL_DOCUMENTS = 1000
+
+# Indicateurs comparés à la référence : (nom, True si une valeur plus grande est meilleure)
+COMPARED_METRICS = [
+    ("cold_start_ms", False),
+    ("p50_ms", False),
+    ("p95_ms", False),
+    ("docs_per_second", True),
+    ("peak_rss_mb", False),
+]
+
+
+def generate_corpus(name, seed=0):
+    """Produit les documents du corpus `name`, de manière reproductible et sans tout garder en mémoire."""
+    if name == "sujets":
+        yield from texts.values()
+        return
+    n_documents, n_words = SYNTHETIC_CORPORA[name]
+    vocabulary = [word for text in texts.values() for word in text.split()]
+    rng = random.Random(f"{seed}:{name}")
+    for _ in range(n_documents):
+        yield " ".join(rng.choices(vocabulary, k=n_words))
+
+
+def percentile(sorted_values, q):
+    """Percentile par rang le plus proche d'une liste triée."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus courant (ru_maxrss est en Ko sous Linux, en octets sous macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def reset_word_caches(scorers):
+    """Vide les caches mot -> score AraBERT, afin que chaque corpus mesure l'inférence et pas le cache."""
+    for scorer in scorers:
+        scorer.cache.clear()
+
+
+def word_cache_hit_rate(scorers):
+    """Part des mots servis par les caches AraBERT (None si aucun mot n'a été scoré)."""
+    hits = sum(scorer.cache.hits for scorer in scorers)
+    lookups = hits + sum(scorer.cache.misses for scorer in scorers)
+    return hits / lookups if lookups else None
+
+
+def run_method(method, corpora, top_n=10, seed=0, process_start=None):
+    """Mesure une méthode dans le processus courant (qui doit être neuf pour le démarrage à froid)."""
+    process_start = process_start or time.perf_counter()
+    import_start = time.perf_counter()
+    import instrumentation
+    from keyword_extraction import METHODS, arabert_scorers, preprocess
+    import_ms = (time.perf_counter() - import_start) * 1000
+
+    # Démarrage à froid : import, chargement des modèles et premier résultat
+    first_start = time.perf_counter()
+    METHODS[method](preprocess(next(iter(texts.values()))), top_n=top_n)
+    first_call_ms = (time.perf_counter() - first_start) * 1000
+
+    results = {
+        "method": method,
+        "import_ms": import_ms,
+        "first_call_ms": first_call_ms,
+        "heavy_modules": [module for module in HEAVY_MODULES if module in sys.modules],
+        "cold_start_ms": (time.perf_counter() - process_start) * 1000,
+        "corpora": {},
+    }
+    for corpus in corpora:
+        # Mesures sans instrumentation, dont le coût fausserait les latences
+        instrumentation.configure(enabled=False)
+        scorers = arabert_scorers.values()
+        reset_word_caches(scorers)
+        latencies, stages = [], {"preprocess": 0.0, "extract": 0.0}
+        corpus_start = time.perf_counter()
+        for document in generate_corpus(corpus, seed):
+            start = time.perf_counter()
+            cleaned = preprocess(document)
+            cleaned_at = time.perf_counter()
+            METHODS[method](cleaned, top_n=top_n)
+            end = time.perf_counter()
+            stages["preprocess"] += (cleaned_at - start) * 1000
+            stages["extract"] += (end - cleaned_at) * 1000
+            latencies.append((end - start) * 1000)
+        elapsed = time.perf_counter() - corpus_start
+        # Mots répétés d'un document à l'autre du corpus : part de la latence qui ne passe pas par AraBERT
+        hit_rate = word_cache_hit_rate(scorers)
+
+        # Détail par étape (nettoyage, TF-IDF, tokenisation, inférence...) : passe séparée, non chronométrée
+        instrumentation.configure(enabled=True)
+        instrumentation.registry.reset()
+        reset_word_caches(scorers)
+        detailed_documents = 0
+        for document in islice(generate_corpus(corpus, seed), DETAIL_DOCUMENTS):
+            METHODS[method](preprocess(document), top_n=top_n)
+            detailed_documents += 1
+        detailed_stages = instrumentation.registry.summary()
+        instrumentation.configure(enabled=False)
+
+        latencies.sort()
+        results["corpora"][corpus] = {
+            "documents": len(latencies),
+            "p50_ms": percentile(latencies, 50),
+            "p90_ms": percentile(latencies, 90),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else 0.0,
+            "docs_per_second": len(latencies) / elapsed if elapsed else 0.0,
+            "word_cache_hit_rate": hit_rate,
+            "stages_ms": stages,
+            "detailed_documents": detailed_documents,
+            "detailed_stages_ms": detailed_stages,
+        }
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def run_in_subprocess(method, corpora, top_n, seed):
+    """Lance la mesure d'une méthode dans un processus neuf (démarrage à froid et pic mémoire isolés)."""
+    env = dict(os.environ)
+    # Les caches persistés (résultats, scores AraBERT d'une exécution précédente) fausseraient les mesures
+    env.pop("KEYWORD_RESULT_CACHE", None)
+    env.pop("KEYWORD_ARABERT_CACHE", None)
+    command = [sys.executable, os.path.abspath(__file__), "--worker", method,
+               "--corpora", *corpora, "--top-n", str(top_n), "--seed", str(seed)]
+    completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"method": method, "error": completed.stderr.strip().splitlines()[-1:] or ["?"]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Retourne la liste des régressions supérieures à `threshold` par rapport à la référence."""
+    regressions = []
+    baseline_methods = {run["method"]: run for run in baseline.get("runs", []) if "error" not in run}
+    for run in results["runs"]:
+        reference = baseline_methods.get(run["method"])
+        if reference is None or "error" in run:
+            continue
+        pairs = [("", run, reference)] + [
+            (corpus, run["corpora"][corpus], reference["corpora"][corpus])
+            for corpus in run["corpora"] if corpus in reference.get("corpora", {})
+        ]
+        for corpus, current, previous in pairs:
+            for metric, higher_is_better in COMPARED_METRICS:
+                if metric not in current or not previous.get(metric):
+                    continue
+                change = (current[metric] - previous[metric]) / previous[metric]
+                if (-change if higher_is_better else change) > threshold:
+                    regressions.append({
+                        "method": run["method"], "corpus": corpus or None, "metric": metric,
+                        "baseline": previous[metric], "current": current[metric], "change": change,
+                    })
+    return regressions
+
+
+def check_startup_budget(results, budget_ms):
+    """Retourne les dépassements du budget de démarrage par les méthodes sans modèle."""
+    violations = []
+    for run in results["runs"]:
+        if run["method"] not in MODEL_FREE_METHODS or "error" in run:
+            continue
+        startup_ms = run["import_ms"] + run["first_call_ms"]
+        if startup_ms > budget_ms:
+            violations.append(f"{run['method']} : démarrage en {startup_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+        if run["heavy_modules"]:
+            violations.append(f"{run['method']} : importe {', '.join(run['heavy_modules'])}")
+    return violations
+
+
+def print_summary(results):
+    print(f"{'Méthode':<26} {'Corpus':<14} {'p50 ms':>9} {'p95 ms':>9} {'docs/s':>9} {'RSS Mo':>8} {'cache mots':>11}")
+    for run in results["runs"]:
+        if "error" in run:
+            print(f"{run['method']:<26} ERREUR : {run['error'][0]}")
+            continue
+        print(f"{run['method']:<26} {'(à froid)':<14} {run['cold_start_ms']:>9.0f} {'':>9} {'':>9} {run['peak_rss_mb']:>8.0f}")
+        for corpus, stats in run["corpora"].items():
+            hit_rate = stats.get("word_cache_hit_rate")
+            print(f"{'':<26} {corpus:<14} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                  f"{stats['docs_per_second']:>9.1f} {'':>8} {'-' if hit_rate is None else f'{hit_rate:.0%}':>11}")
+
+
+def main():
+    process_start = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Benchmark reproductible des méthodes d'extraction de mots-clés.")
+    parser.add_argument("--methods", nargs="+", default=METHOD_NAMES, choices=METHOD_NAMES)
+    parser.add_argument("--profile", choices=list(PROFILES), default="quick")
+    parser.add_argument("--corpora", nargs="+", choices=["sujets"] + list(SYNTHETIC_CORPORA),
+                        help="Corpus à utiliser (remplace --profile)")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Fichier de résultats de référence")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Régression tolérée (0.2 = 20 %%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistrer les résultats comme référence")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Durée maximale de l'import et du premier résultat pour YAKE et TF-IDF")
+    parser.add_argument("--worker", metavar="METHOD", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    corpora = args.corpora or PROFILES[args.profile]
+
+    if args.worker:
+        result = run_method(args.worker, corpora, top_n=args.top_n, seed=args.seed, process_start=process_start)
+        print(json.dumps(result))
+        return 0
+
+    results = {
+        "environment": environment(),
+        "settings": {"corpora": corpora, "top_n": args.top_n, "seed": args.seed},
+        "runs": [],
+    }
+    for method in args.methods:
+        print(f"Benchmark : {method}...", file=sys.stderr)
+        results["runs"].append(run_in_subprocess(method, corpora, args.top_n, args.seed))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print_summary(results)
+
+    violations = check_startup_budget(results, args.startup_budget_ms)
+    if violations:
+        print("\nBUDGET DE DÉMARRAGE DÉPASSÉ :", file=sys.stderr)
+        for violation in violations:
+            print(f"  {violation}", file=sys.stderr)
+
+    if args.save_baseline and args.baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    elif args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\nRÉGRESSIONS (> {args.threshold:.0%}) :", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression['method']} {regression['corpus'] or ''} {regression['metric']} : "
+                      f"{regression['baseline']:.2f} -> {regression['current']:.2f} ({regression['change']:+.0%})",
+                      file=sys.stderr)
+            return 1
+    if violations or any("error" in run for run in results["runs"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import abc
+
+from instrumentation import stage
+
+
+class Document:
+    """Représentation intermédiaire d'un document, partagée par les étapes des méthodes hybrides.
+
+    Le texte est nettoyé une seule fois ; les scores de chaque étape sont
+    conservés dans `scores` et réutilisés par toutes les méthodes qui
+    appliquent la même étape au même document. Le découpage en mots n'est
+    pas partagé : YAKE et TF-IDF tokenisent le texte chacun à leur manière.
+    """
+
+    __slots__ = ("text", "scores")
+
+    def __init__(self, text):
+        self.text = text
+        self.scores = {}
+
+
+def make_documents(texts, clean=None):
+    """Construit les documents ; `clean` est appliqué une fois par texte s'il est fourni."""
+    return [Document(clean(text) if clean else text) for text in texts]
+
+
+class TextStage(abc.ABC):
+    """Étape qui score les mots d'un document à partir de son texte (TF-IDF, YAKE...)."""
+
+    name = None
+    higher_is_better = True
+
+    def __init__(self, extract):
+        self.extract = extract
+
+    @abc.abstractmethod
+    def score_document(self, document, top_n):
+        """Retourne un dictionnaire mot -> score pour `document`."""
+
+    def run(self, documents, top_n, candidates=None):
+        """Retourne un dictionnaire mot -> score par document, calculé une seule fois par document."""
+        key = (self.name, top_n)
+        for document in documents:
+            if key not in document.scores:
+                document.scores[key] = self.score_document(document, top_n)
+        return [document.scores[key] for document in documents]
+
+
+class TfidfStage(TextStage):
+    name = "tfidf"
+
+    def score_document(self, document, top_n):
+        try:
+            return dict(self.extract([document.text], top_n))
+        except ValueError:
+            # Vocabulaire vide (texte sans mot arabe ou seulement des stopwords) : aucun candidat,
+            # sans faire échouer les autres documents du lot
+            return {}
+
+
+class YakeStage(TextStage):
+    name = "yake"
+    higher_is_better = False  # Un score YAKE plus petit est meilleur
+
+    def score_document(self, document, top_n):
+        scores = {}
+        for keyword, score in self.extract(document.text, top_n):
+            scores.setdefault(keyword, score)
+        return scores
+
+
+class ArabertStage:
+    """Étape qui score les mots candidats avec AraBERT, en un seul lot pour tous les documents."""
+
+    higher_is_better = True
+
+    def __init__(self, scorer, name="arabert"):
+        self.scorer = scorer
+        self.name = name
+
+    def run(self, documents, top_n, candidates):
+        missing = [
+            [word for word in words if word not in document.scores.get(self.name, {})]
+            for document, words in zip(documents, candidates)
+        ]
+        if any(missing):
+            with stage("calculate_arabert_scores"):
+                scores = self.scorer.score_documents(missing)
+            for document, document_scores in zip(documents, scores):
+                document.scores.setdefault(self.name, {}).update(document_scores)
+        return [document.scores.get(self.name, {}) for document in documents]
+
+
+def sum_fusion(candidates, stage_scores, stages):
+    """Somme des scores bruts de chaque étape (un score absent vaut 0)."""
+    return {word: sum(scores.get(word, 0) for scores in stage_scores) for word in candidates}
+
+
+def normalized_fusion(weights=None):
+    """Fusion par somme pondérée de scores ramenés sur [0, 1].
+
+    Chaque étape est normalisée (min-max sur les candidats du document) et
+    inversée lorsqu'un score plus petit est meilleur, afin que les échelles
+    de TF-IDF, YAKE et AraBERT soient comparables.
+    """
+    weights = weights or {}
+
+    def fuse(candidates, stage_scores, stages):
+        combined = dict.fromkeys(candidates, 0.0)
+        for current_stage, scores in zip(stages, stage_scores):
+            values = [scores[word] for word in candidates if word in scores]
+            if not values:
+                continue
+            low, span = min(values), max(values) - min(values)
+            weight = weights.get(current_stage.name, 1.0)
+            for word in candidates:
+                if word in scores:
+                    normalized = (scores[word] - low) / span if span else 1.0
+                    if not current_stage.higher_is_better:
+                        normalized = 1.0 - normalized
+                    combined[word] += weight * normalized
+        return combined
+
+    return fuse
+
+
+class HybridMethod:
+    """Méthode hybride déclarée à partir d'étapes existantes.
+
+    `candidates` fournit les mots candidats (et leur premier score), chaque
+    étape de `scorers` ajoute un score par candidat, et `fusion` combine les
+    scores. Exemple : HybridMethod(TfidfStage(...), [YakeStage(...)], normalized_fusion()).
+    """
+
+    def __init__(self, candidates, scorers=(), fusion=sum_fusion):
+        self.candidates = candidates
+        self.scorers = list(scorers)
+        self.fusion = fusion
+
+    def extract_documents(self, documents, top_n=10):
+        """Retourne les `top_n` mots-clés de chaque document, triés par score combiné décroissant."""
+        candidate_scores = self.candidates.run(documents, top_n)
+        candidate_words = [list(scores) for scores in candidate_scores]
+        scorer_scores = [scorer.run(documents, top_n, candidate_words) for scorer in self.scorers]
+        stages = [self.candidates] + self.scorers
+
+        results = []
+        for i, words in enumerate(candidate_words):
+            stage_scores = [candidate_scores[i]] + [scores[i] for scores in scorer_scores]
+            combined = self.fusion(words, stage_scores, stages)
+            results.append(sorted(combined.items(), key=lambda x: x[1], reverse=True)[:top_n])
+        return results
+
+    def extract(self, texts, top_n=10, clean=None):
+        """Construit les documents (nettoyés par `clean` s'il est fourni) puis extrait leurs mots-clés."""
+        return self.extract_documents(make_documents(texts, clean), top_n)
@@ -0,0 +1,254 @@
+import contextlib
+import contextvars
+import functools
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+
+# Bornes des histogrammes (en secondes)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = os.environ.get("KEYWORD_INSTRUMENTATION", "0") == "1"
+_track_allocations = False
+_profile_slow_ms = None
+_profile_dir = "profiles"
+
+_current_trace = contextvars.ContextVar("keyword_trace", default=None)
+
+
+class Histogram:
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+class MetricsRegistry:
+    """Métriques du processus : durée (histogramme), temps CPU et allocations par étape et par méthode.
+
+    Le temps CPU est celui de tout le processus pendant l'étape (threads de
+    torch compris) : il se recoupe entre requêtes traitées en parallèle.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wall = defaultdict(Histogram)
+        self.cpu = defaultdict(float)
+        self.allocations = defaultdict(int)
+
+    def record(self, stage, method, wall_seconds, cpu_seconds, allocated_bytes=None):
+        key = (stage, method or "")
+        with self._lock:
+            self.wall[key].observe(wall_seconds)
+            self.cpu[key] += cpu_seconds
+            if allocated_bytes is not None:
+                self.allocations[key] += allocated_bytes
+
+    def reset(self):
+        with self._lock:
+            self.wall.clear()
+            self.cpu.clear()
+            self.allocations.clear()
+
+    def summary(self):
+        """Temps total (ms) par étape, toutes méthodes confondues."""
+        totals = defaultdict(float)
+        with self._lock:
+            for (stage, _), histogram in self.wall.items():
+                totals[stage] += histogram.sum * 1000
+        return dict(totals)
+
+    def to_prometheus(self):
+        """Exporte les métriques au format texte de Prometheus."""
+        lines = [
+            "# HELP keyword_stage_duration_seconds Durée des étapes d'extraction.",
+            "# TYPE keyword_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (stage, method), histogram in sorted(self.wall.items()):
+                labels = f'stage="{stage}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'keyword_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'keyword_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"keyword_stage_duration_seconds_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"keyword_stage_duration_seconds_count{{{labels}}} {histogram.count}")
+
+            lines += [
+                "# HELP keyword_stage_cpu_seconds_total Temps CPU du processus pendant les étapes d'extraction "
+                "(tous threads confondus, recoupé entre requêtes simultanées).",
+                "# TYPE keyword_stage_cpu_seconds_total counter",
+            ]
+            for (stage, method), value in sorted(self.cpu.items()):
+                lines.append(f'keyword_stage_cpu_seconds_total{{stage="{stage}",method="{method}"}} {value}')
+
+            if self.allocations:
+                lines += [
+                    "# HELP keyword_stage_allocated_bytes_total Mémoire allouée (nette) par les étapes.",
+                    "# TYPE keyword_stage_allocated_bytes_total counter",
+                ]
+                for (stage, method), value in sorted(self.allocations.items()):
+                    lines.append(f'keyword_stage_allocated_bytes_total{{stage="{stage}",method="{method}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """Trace d'une requête : liste des étapes avec leur début, durée et temps CPU."""
+
+    def __init__(self, method):
+        self.method = method
+        self.start = time.perf_counter()
+        self.spans = []
+        self.duration_ms = None
+
+    def to_dict(self):
+        return {"method": self.method, "duration_ms": self.duration_ms, "stages": self.spans}
+
+
+class SamplingProfiler:
+    """Échantillonne périodiquement la pile d'un thread et compte les piles observées."""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        """Écrit les piles au format « collapsed » (utilisable par flamegraph.pl ou speedscope)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+registry = MetricsRegistry()
+
+
+def configure(enabled=True, track_allocations=False, profile_slow_ms=None, profile_dir="profiles"):
+    """Active ou désactive l'instrumentation.
+
+    Avec `profile_slow_ms`, chaque requête est échantillonnée et le profil des
+    requêtes plus lentes que ce seuil est écrit dans `profile_dir`.
+    """
+    global _enabled, _track_allocations, _profile_slow_ms, _profile_dir
+    _enabled = enabled
+    _track_allocations = enabled and track_allocations
+    _profile_slow_ms = profile_slow_ms if enabled else None
+    _profile_dir = profile_dir
+    if _track_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def is_enabled():
+    return _enabled
+
+
+@contextlib.contextmanager
+def _measure(name):
+    trace = _current_trace.get()
+    allocated_before = tracemalloc.get_traced_memory()[0] if _track_allocations else None
+    # Temps CPU de tout le processus : les calculs de torch tournent sur ses propres threads
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        allocated = tracemalloc.get_traced_memory()[0] - allocated_before if _track_allocations else None
+        registry.record(name, trace.method if trace else None, wall, cpu, allocated)
+        if trace is not None:
+            span = {"stage": name, "start_ms": (start - trace.start) * 1000,
+                    "wall_ms": wall * 1000, "cpu_ms": cpu * 1000}
+            if allocated is not None:
+                span["allocated_bytes"] = allocated
+            trace.spans.append(span)
+
+
+def stage(name):
+    """Mesure une étape (contexte `with`) ; sans effet si l'instrumentation est désactivée."""
+    if not _enabled:
+        return contextlib.nullcontext()
+    return _measure(name)
+
+
+def instrumented(name):
+    """Décorateur qui mesure chaque appel de la fonction comme l'étape `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _measure(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def request(method):
+    """Ouvre la trace d'une requête et la retourne (None si l'instrumentation est désactivée).
+
+    Une requête imbriquée dans une autre réutilise la trace existante.
+    """
+    current = _current_trace.get()
+    if not _enabled or current is not None:
+        yield current
+        return
+
+    trace = Trace(method)
+    token = _current_trace.set(trace)
+    profiler = None
+    if _profile_slow_ms is not None:
+        profiler = SamplingProfiler(threading.get_ident())
+        profiler.start()
+    try:
+        with _measure("total"):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.duration_ms = (time.perf_counter() - trace.start) * 1000
+        if profiler is not None:
+            profiler.stop()
+            if trace.duration_ms >= _profile_slow_ms:
+                os.makedirs(_profile_dir, exist_ok=True)
+                name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{method}.txt".replace(" ", "")
+                profiler.dump(os.path.join(_profile_dir, name.replace("+", "_")))
+
+
+if _enabled:
+    configure(
+        track_allocations=os.environ.get("KEYWORD_INSTRUMENTATION_ALLOCATIONS", "0") == "1",
+        profile_slow_ms=float(os.environ["KEYWORD_PROFILE_SLOW_MS"]) if os.environ.get("KEYWORD_PROFILE_SLOW_MS") else None,
+        profile_dir=os.environ.get("KEYWORD_PROFILE_DIR", "profiles"),
+    )
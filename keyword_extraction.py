@@ -0,0 +1,416 @@
+import functools
+import os
+import re
+from model_registry import model_registry
+from arabert_scoring import ArabertScorer, WordScoreCache
+from arabic_normalizer import ArabicNormalizer
+from result_cache import ResultCache
+from instrumentation import instrumented, request, stage
+from hybrid_pipeline import ArabertStage, HybridMethod, TfidfStage, YakeStage
+from quantization import PRECISIONS, load_quantized, load_quantized_sentence_transformer
+from offline_resources import load_arabic_stopwords, model_path
+
+# torch, transformers, keybert et yake sont importés à la première utilisation d'une méthode
+# qui en a besoin, et les stopwords sont lus depuis une liste précompilée : l'import ne
+# télécharge rien, et YAKE et TF-IDF fonctionnent sans charger torch
+arabic_stopwords = load_arabic_stopwords()
+
+# Modèles chargés à la première utilisation et partagés par le processus
+ARABERT_MODEL = "aubmindlab/bert-base-arabert"
+KEYBERT_MODELS = {
+    "DistilBERT": 'distilbert-base-nli-mean-tokens',
+    "AraBERT": 'asafaya/bert-base-arabic',
+    "XLMRoBerta": 'xlm-roberta-base',
+}
+
+KEYBERT_METHODS = {
+    "DistilBERT": "KeyBERT + DistilBERT",
+    "AraBERT": "KeyBERT + AraBERT",
+    "XLMRoBerta": "KeyBERT + XLM-RoBERTa",
+}
+
+def load_arabert(precision="fp32"):
+    """Charge le couple (tokenizer, modèle) AraBERT, depuis KEYWORD_MODELS_DIR s'il y a été copié."""
+    from transformers import AutoModel, AutoTokenizer
+    path = model_path(ARABERT_MODEL)
+    tokenizer = AutoTokenizer.from_pretrained(path)
+    if precision == "fp32":
+        return tokenizer, AutoModel.from_pretrained(path)
+    return tokenizer, load_quantized(ARABERT_MODEL, lambda: AutoModel.from_pretrained(path))
+
+def load_keybert(model, precision="fp32"):
+    """Charge un modèle KeyBERT, depuis KEYWORD_MODELS_DIR s'il y a été copié."""
+    from keybert import KeyBERT
+    if precision == "fp32":
+        return KeyBERT(model=model_path(model))
+    return KeyBERT(model=load_quantized_sentence_transformer(model))
+
+model_registry.register("arabert", load_arabert)
+model_registry.register("arabert:int8", functools.partial(load_arabert, "int8"))
+for _name, _model in KEYBERT_MODELS.items():
+    model_registry.register(f"keybert:{_name}", functools.partial(load_keybert, _model))
+    model_registry.register(f"keybert:{_name}:int8", functools.partial(load_keybert, _model, "int8"))
+
+# Précision d'inférence par méthode : "fp32" par défaut, "int8" (quantification dynamique sur CPU)
+# pour les méthodes listées dans KEYWORD_INT8_METHODS (noms séparés par des virgules, ou "all")
+_int8_methods = {method.strip() for method in os.environ.get("KEYWORD_INT8_METHODS", "").split(",") if method.strip()}
+method_precision = {}
+
+def get_method_precision(method):
+    """Retourne la précision d'inférence ("fp32" ou "int8") utilisée par `method`."""
+    if method in method_precision:
+        return method_precision[method]
+    return "int8" if method in _int8_methods or "all" in _int8_methods else "fp32"
+
+def set_method_precision(method, precision):
+    """Choisit la précision d'inférence de `method`."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Précision inconnue : {precision}")
+    method_precision[method] = precision
+
+def get_arabert(precision="fp32"):
+    """Retourne le couple (tokenizer, modèle) AraBERT partagé."""
+    return model_registry.get("arabert" if precision == "fp32" else f"arabert:{precision}")
+
+def get_keybert(name):
+    """Retourne le modèle KeyBERT partagé pour la variante `name`, dans la précision choisie pour sa méthode."""
+    precision = get_method_precision(KEYBERT_METHODS[name])
+    return model_registry.get(f"keybert:{name}" if precision == "fp32" else f"keybert:{name}:{precision}")
+
+# Fonction de nettoyage
+def remove_foreign_words(text):
+    """Supprime les mots contenant des caractères non arabes."""
+    return re.sub(r'\b[^\u0600-\u06FF]+\b', ' ', text)
+
+def remove_diacritics(text):
+    """Supprime les diacritiques de l'arabe."""
+    return re.sub(r'[\u064B-\u065F]', '', text)
+
+def remove_punctuation_and_symbols(text):
+    """Supprime la ponctuation et les symboles inutiles."""
+    return re.sub(r'[،.؟!:\-(){}\[\];"\'~@#$%^&*_+]', '', text)
+
+def remove_numbers_and_symbols(text):
+    """Supprime les chiffres et autres symboles."""
+    return re.sub(r'[0-9\u0660-\u0669\u06F0-\u06F9%$#@!&^]', '', text)
+
+def remove_multiple_spaces(text):
+    """Supprime les espaces multiples."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+custom_stopwords = [
+    'و', 'في', 'على', 'من', 'إلى', 'عن', 'مع', 'إن', 'إلا', 'هذا', 'تلك',
+    'ذلك', 'التي', 'هو', 'هي', 'هم', 'أو', 'أي', 'أيضا', 'كان', 'تكون', 'عندما',
+    'لذلك', 'لكن', 'لأن', 'هذه', 'أن', 'أنت', 'نحن', 'أنتِ', 'له', 'لها', 'علي',
+    'لن', 'فيما', 'مما', 'منذ', 'إحدى', 'لا', 'ال', 'أكثر', 'أقل', 'أولا', 'سوف',
+    'عند', 'الذي', 'الذين', 'ثم', 'لم', 'لو', 'ماذا', 'بين', 'إذا', 'بعد', 'قبل',
+    'داخل', 'خارج', 'بعض', 'كل', 'أول', 'ثاني', 'آخر', 'الأخرى', 'نعم', 'بينما'
+]
+
+# Normaliseur précompilé, au résultat identique aux étapes ci-dessus
+normalizer = ArabicNormalizer(set(arabic_stopwords) | set(custom_stopwords))
+_default_custom_stopwords = custom_stopwords
+
+@instrumented("remove_stopwords")
+def remove_stopwords(text, custom_stopwords):
+    """Supprime les stopwords personnalisés et les stopwords arabes."""
+    if custom_stopwords is _default_custom_stopwords:
+        return normalizer.remove_stopwords(text)
+    return normalizer.remove_stopwords(text, set(arabic_stopwords) | set(custom_stopwords))
+
+@instrumented("clean_text")
+def clean_text(text):
+    """Applique toutes les étapes de nettoyage."""
+    return normalizer.clean(text)
+
+@functools.lru_cache(maxsize=None)
+def get_tfidf_engine():
+    """Modèle TF-IDF de référence (voir tfidf_engine.py), chargé au premier appel si KEYWORD_TFIDF_MODEL est défini."""
+    if not os.environ.get("KEYWORD_TFIDF_MODEL"):
+        return None
+    from tfidf_engine import TfidfEngine
+    return TfidfEngine.load(os.environ["KEYWORD_TFIDF_MODEL"])
+
+@instrumented("calculate_tfidf")
+def calculate_tfidf(corpus, top_n=10):
+    """Applique le modèle TF-IDF au texte et retourne les mots-clés et leurs scores."""
+    tfidf_engine = get_tfidf_engine()
+    if tfidf_engine is not None:
+        # IDF du corpus de référence : les documents sont seulement transformés
+        keywords_scores = [pair for keywords in tfidf_engine.top_keywords(corpus, top_n) for pair in keywords]
+        return sorted(keywords_scores, key=lambda x: x[1], reverse=True)
+
+    from tfidf_engine import tfidf_keywords
+    keywords_scores = tfidf_keywords(corpus, stop_words=arabic_stopwords, max_features=top_n)
+    
+    # Trier les mots-clés par score décroissant
+    sorted_keywords_scores = sorted(keywords_scores, key=lambda x: x[1], reverse=True)
+    
+    return sorted_keywords_scores
+
+# Fonction YAKE modifiée pour retourner les scores et trier par ordre croissant
+@instrumented("extract_with_yake")
+def extract_with_yake(text, top_n=10):
+    """Extrait des mots-clés en utilisant YAKE avec calcul du score et tri par score croissant."""
+    from yake import KeywordExtractor
+    extractor = KeywordExtractor(lan="ar", n=1, top=top_n)
+    keywords_with_scores = extractor.extract_keywords(text)
+    
+    # Trier les mots-clés par score croissant
+    sorted_keywords = sorted(keywords_with_scores, key=lambda x: x[1], reverse=False)
+    
+    return sorted_keywords
+
+def deduplicate_keywords(keywords):
+    """Supprime les doublons en conservant le score le plus élevé, triés par score décroissant."""
+    unique_keywords = {}
+    for keyword, score in keywords:
+        if keyword not in unique_keywords or score > unique_keywords[keyword]:
+            unique_keywords[keyword] = score
+    return sorted(unique_keywords.items(), key=lambda x: x[1], reverse=True)
+
+def extract_batch_with_keybert(name, texts, top_n=10):
+    """Extrait les mots-clés de plusieurs textes avec la variante KeyBERT `name`, en un seul lot d'embeddings."""
+    kw_model = get_keybert(name)
+    with stage("keybert_embedding"):
+        keywords = kw_model.extract_keywords(list(texts), top_n=top_n)
+    # KeyBERT retourne [] lorsqu'aucun document du lot n'a de vocabulaire,
+    # et une liste à plat lorsque le lot ne contient qu'un document
+    if not keywords:
+        keywords = [[] for _ in texts]
+    elif len(texts) == 1 and isinstance(keywords[0], tuple):
+        keywords = [keywords]
+    return [deduplicate_keywords(document_keywords) for document_keywords in keywords]
+
+# Fonction KeyBERT avec DistilBERT
+def extract_with_keybert_DistilBERT(text, top_n=10):
+    """Extrait des mots-clés en utilisant KeyBERT avec DistilBERT."""
+    kw_model = get_keybert("DistilBERT")
+    with stage("keybert_embedding"):
+        keywords = kw_model.extract_keywords(text, top_n=top_n)
+    
+    # Supprimer les doublons tout en conservant le score le plus élevé pour chaque mot-clé
+    return deduplicate_keywords(keywords)
+
+def extract_with_keybert_AraBERT(text, top_n=10):
+    """Extrait des mots-clés en utilisant KeyBERT avec AraBERT."""
+    kw_model = get_keybert("AraBERT")
+    with stage("keybert_embedding"):
+        keywords = kw_model.extract_keywords(text, top_n=top_n)
+    
+    # Supprimer les doublons tout en conservant le score le plus élevé pour chaque mot-clé
+    return deduplicate_keywords(keywords)
+
+# Fonction pour extraire les mots-clés avec KeyBERT utilisant le modèle XLM-RoBERTa
+def extract_with_keybert_XLMRoBerta(text, top_n=10):
+    """Extrait des mots-clés en utilisant KeyBERT avec le modèle XLM-RoBERTa."""
+    kw_model = get_keybert("XLMRoBerta")
+    with stage("keybert_embedding"):
+        keywords = kw_model.extract_keywords(text, top_n=top_n)
+    
+    # Supprimer les doublons tout en conservant le score le plus élevé pour chaque mot-clé
+    return deduplicate_keywords(keywords)
+
+# Scores AraBERT calculés par lots, avec cache mot -> score (persisté si KEYWORD_ARABERT_CACHE est défini)
+arabert_scorers = {
+    precision: ArabertScorer(
+        functools.partial(get_arabert, precision),
+        batch_size=int(os.environ.get("KEYWORD_ARABERT_BATCH_SIZE", 64)),
+        cache=WordScoreCache(
+            max_size=int(os.environ.get("KEYWORD_ARABERT_CACHE_SIZE", 50000)),
+            path=(
+                os.environ["KEYWORD_ARABERT_CACHE"] + ("" if precision == "fp32" else f".{precision}")
+                if os.environ.get("KEYWORD_ARABERT_CACHE") else None
+            ),
+            model_name=ARABERT_MODEL if precision == "fp32" else f"{ARABERT_MODEL}:{precision}",
+            save_every=int(os.environ.get("KEYWORD_ARABERT_CACHE_SAVE_EVERY", 1000)),
+        ),
+    )
+    for precision in PRECISIONS
+}
+arabert_scorer = arabert_scorers["fp32"]
+
+def flush_caches():
+    """Sauvegarde les scores AraBERT (à appeler par les processus qui ne passent pas par atexit)."""
+    for scorer in arabert_scorers.values():
+        scorer.cache.save()
+
+# Fonction pour calculer les scores AraBERT
+@instrumented("calculate_arabert_scores")
+def calculate_arabert_scores(words, batch_size=None):
+    """Calcule le score AraBERT de chaque mot (moyenne de l'embedding [CLS])."""
+    return arabert_scorer.score(words, batch_size=batch_size)
+
+# Étapes partagées par les méthodes hybrides : chaque document est nettoyé une seule fois,
+# et les scores TF-IDF, YAKE et AraBERT sont calculés une fois puis combinés par mot
+tfidf_stage = TfidfStage(calculate_tfidf)
+yake_stage = YakeStage(extract_with_yake)
+arabert_stages = {
+    precision: ArabertStage(scorer, name="arabert" if precision == "fp32" else f"arabert-{precision}")
+    for precision, scorer in arabert_scorers.items()
+}
+
+# Une déclaration par précision d'inférence d'AraBERT
+HYBRID_METHODS = {
+    "TF-IDF + AraBERT": {
+        precision: HybridMethod(tfidf_stage, [scorer_stage])
+        for precision, scorer_stage in arabert_stages.items()
+    },
+    "TF-IDF + Yake + AraBERT": {
+        precision: HybridMethod(tfidf_stage, [yake_stage, scorer_stage])
+        for precision, scorer_stage in arabert_stages.items()
+    },
+}
+
+def hybrid_method(method):
+    """Retourne la méthode hybride `method` dans la précision choisie."""
+    return HYBRID_METHODS[method][get_method_precision(method)]
+
+# Fonction combinée TF-IDF + AraBERT, sur un lot de textes
+def extract_with_tfidf_arabert_batch(texts, top_n=10, cleaned=False):
+    """Extrait des mots-clés en combinant TF-IDF et AraBERT ; les mots de tous les textes sont scorés ensemble."""
+    return hybrid_method("TF-IDF + AraBERT").extract(texts, top_n, clean=None if cleaned else clean_text)
+
+def extract_with_tfidf_arabert(text, top_n=10):
+    """Extrait des mots-clés en combinant TF-IDF et AraBERT."""
+    return extract_with_tfidf_arabert_batch([text], top_n)[0]
+
+def extract_with_tfidf_yake_arabert_batch(texts, top_n=10, cleaned=False):
+    """Extrait les mots-clés avec une combinaison de TF-IDF, YAKE et AraBERT, sur un lot de textes."""
+    return hybrid_method("TF-IDF + Yake + AraBERT").extract(texts, top_n, clean=None if cleaned else clean_text)
+
+def extract_with_tfidf_yake_arabert(text, top_n=10):
+    """Extrait les mots-clés avec une combinaison de TF-IDF, YAKE et AraBERT."""
+    return extract_with_tfidf_yake_arabert_batch([text], top_n)[0]
+
+# Méthodes disponibles, sous le nom des boutons de l'interface
+METHODS = {
+    "YAKE": extract_with_yake,
+    "TF-IDF": lambda text, top_n=10: calculate_tfidf([text], top_n=top_n),
+    "KeyBERT + DistilBERT": extract_with_keybert_DistilBERT,
+    # Le texte reçu est déjà prétraité : les méthodes hybrides ne le nettoient pas une seconde fois
+    "TF-IDF + AraBERT": lambda text, top_n=10: extract_with_tfidf_arabert_batch([text], top_n, cleaned=True)[0],
+    "KeyBERT + AraBERT": extract_with_keybert_AraBERT,
+    "KeyBERT + XLM-RoBERTa": extract_with_keybert_XLMRoBerta,
+    "TF-IDF + Yake + AraBERT": lambda text, top_n=10: extract_with_tfidf_yake_arabert_batch([text], top_n, cleaned=True)[0],
+}
+
+# Versions par lots des méthodes à modèle : une seule inférence pour tout le lot
+BATCH_METHODS = {
+    "KeyBERT + DistilBERT": functools.partial(extract_batch_with_keybert, "DistilBERT"),
+    "TF-IDF + AraBERT": functools.partial(extract_with_tfidf_arabert_batch, cleaned=True),
+    "KeyBERT + AraBERT": functools.partial(extract_batch_with_keybert, "AraBERT"),
+    "KeyBERT + XLM-RoBERTa": functools.partial(extract_batch_with_keybert, "XLMRoBerta"),
+    "TF-IDF + Yake + AraBERT": functools.partial(extract_with_tfidf_yake_arabert_batch, cleaned=True),
+}
+
+# Modèles nécessaires à chaque méthode (les autres méthodes n'utilisent aucun modèle)
+METHOD_MODELS = {
+    "KeyBERT + DistilBERT": ["keybert:DistilBERT"],
+    "TF-IDF + AraBERT": ["arabert"],
+    "KeyBERT + AraBERT": ["keybert:AraBERT"],
+    "KeyBERT + XLM-RoBERTa": ["keybert:XLMRoBerta"],
+    "TF-IDF + Yake + AraBERT": ["arabert"],
+}
+
+@instrumented("preprocess")
+def preprocess(text):
+    """Nettoie le texte et supprime les stopwords, comme l'interface."""
+    return normalizer.normalize(text)
+
+@instrumented("preprocess")
+def preprocess_batch(texts):
+    """Prétraite une liste de documents."""
+    return normalizer.normalize_batch(texts)
+
+def load_method_models(method):
+    """Charge à l'avance les modèles utilisés par `method`."""
+    precision = get_method_precision(method)
+    for name in METHOD_MODELS.get(method, []):
+        model_registry.get(name if precision == "fp32" else f"{name}:{precision}")
+
+def method_version(method):
+    """Identifie les modèles utilisés par `method` (partie de la clé du cache de résultats)."""
+    versions = [
+        ARABERT_MODEL if name == "arabert" else KEYBERT_MODELS[name.split(":", 1)[1]]
+        for name in METHOD_MODELS.get(method, [])
+    ]
+    if method in METHOD_MODELS and get_method_precision(method) != "fp32":
+        versions.append(get_method_precision(method))
+    if method.startswith("TF-IDF") and get_tfidf_engine() is not None:
+        versions.append(f"tfidf:{get_tfidf_engine().n_documents_}")
+    return ",".join(versions)
+
+# Cache de résultats sur disque partagé entre processus, activé si KEYWORD_RESULT_CACHE est défini
+result_cache = ResultCache(
+    os.environ["KEYWORD_RESULT_CACHE"],
+    ttl=float(os.environ["KEYWORD_RESULT_CACHE_TTL"]) if os.environ.get("KEYWORD_RESULT_CACHE_TTL") else None,
+    max_entries=int(os.environ["KEYWORD_RESULT_CACHE_SIZE"]) if os.environ.get("KEYWORD_RESULT_CACHE_SIZE") else None,
+) if os.environ.get("KEYWORD_RESULT_CACHE") else None
+
+def extract_preprocessed(cleaned_text, method, top_n=10):
+    """Extrait les mots-clés d'un texte déjà prétraité, en passant par le cache de résultats."""
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method}")
+    with request(method):
+        return _extract_preprocessed(cleaned_text, method, top_n)
+
+def _extract_preprocessed(cleaned_text, method, top_n):
+    if result_cache is None:
+        return METHODS[method](cleaned_text, top_n=top_n)
+
+    key = ResultCache.make_key(cleaned_text, method, top_n, method_version(method))
+    with stage("result_cache"):
+        keywords = result_cache.get(key)
+    if keywords is None:
+        keywords = METHODS[method](cleaned_text, top_n=top_n)
+        result_cache.put(key, keywords)
+    return keywords
+
+def extract_keywords(text, method, top_n=10):
+    """Prétraite le texte puis extrait les mots-clés avec la méthode `method`."""
+    with request(method):
+        return extract_preprocessed(preprocess(text), method, top_n=top_n)
+
+def extract_keywords_batch(texts, method, top_n=10):
+    """Prétraite plusieurs textes puis extrait leurs mots-clés.
+
+    Les méthodes à modèle traitent tous les textes absents du cache de
+    résultats en un seul lot.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method}")
+    with request(method):
+        return extract_preprocessed_batch(preprocess_batch(texts), method, top_n=top_n)
+
+def compute_preprocessed_batch(cleaned_texts, method, top_n=10):
+    """Extrait les mots-clés de textes déjà prétraités sans passer par le cache de résultats."""
+    if method in BATCH_METHODS:
+        results = BATCH_METHODS[method](cleaned_texts, top_n=top_n)
+    else:
+        results = [METHODS[method](cleaned_text, top_n=top_n) for cleaned_text in cleaned_texts]
+    if len(results) != len(cleaned_texts):
+        raise RuntimeError(f"{method} : {len(results)} résultats pour {len(cleaned_texts)} textes")
+    return results
+
+def extract_preprocessed_batch(cleaned_texts, method, top_n=10):
+    """Extrait les mots-clés de plusieurs textes déjà prétraités, en un seul lot pour les méthodes à modèle."""
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method}")
+    with request(method):
+        results, keys = [None] * len(cleaned_texts), [None] * len(cleaned_texts)
+        if result_cache is not None:
+            version = method_version(method)
+            with stage("result_cache"):
+                for i, cleaned_text in enumerate(cleaned_texts):
+                    keys[i] = ResultCache.make_key(cleaned_text, method, top_n, version)
+                    results[i] = result_cache.get(keys[i])
+
+        missing = [i for i, keywords in enumerate(results) if keywords is None]
+        if missing:
+            computed = compute_preprocessed_batch([cleaned_texts[i] for i in missing], method, top_n)
+            for i, keywords in zip(missing, computed):
+                results[i] = keywords
+                if result_cache is not None:
+                    result_cache.put(keys[i], keywords)
+        return results
@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import json
+import signal
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+from keyword_extraction import BATCH_METHODS, METHODS, extract_keywords, extract_keywords_batch, load_method_models
+
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+HTTP_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class Overloaded(Exception):
+    """La file d'attente de la méthode est pleine."""
+
+
+class MicroBatcher:
+    """Regroupe les requêtes concurrentes d'une méthode à modèle en lots.
+
+    Un lot part dès qu'il contient `max_batch_size` requêtes ou que la plus
+    ancienne attend depuis `max_wait_ms`. Chaque lot est traité par une seule
+    inférence, dans un thread dédié à la méthode, puis les résultats sont
+    rendus à chaque appelant.
+    """
+
+    def __init__(self, method, max_batch_size=16, max_wait_ms=10, max_queue=256):
+        self.method = method
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"batch-{method}")
+        self.in_flight = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, text, top_n):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((text, top_n, future))
+        except asyncio.QueueFull:
+            raise Overloaded(self.method)
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._process(batch)
+
+    async def _process(self, batch):
+        self.in_flight = len(batch)
+        # Un lot par valeur de top_n (en pratique, presque toujours une seule)
+        groups = {}
+        for text, top_n, future in batch:
+            groups.setdefault(top_n, []).append((text, future))
+        for top_n, items in groups.items():
+            await self._settle(items, top_n)
+        self.in_flight = 0
+        self.batches += 1
+        self.batched_requests += len(batch)
+
+    async def _settle(self, items, top_n):
+        """Extrait les mots-clés d'un lot et transmet à chaque requête son résultat ou l'erreur."""
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.executor, extract_keywords_batch, [text for text, _ in items], self.method, top_n
+            )
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.method} : {len(results)} résultats pour {len(items)} textes")
+        except Exception as e:
+            if len(items) > 1:
+                # Lot repris texte par texte : seule la requête fautive reçoit l'erreur
+                for item in items:
+                    await self._settle([item], top_n)
+                return
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), keywords in zip(items, results):
+            if not future.done():
+                future.set_result(keywords)
+
+    async def close(self):
+        """Traite les requêtes déjà en file puis arrête le lot."""
+        await self.queue.put(None)
+        await self._task
+        self.executor.shutdown()
+
+
+class KeywordService:
+    """Service HTTP asynchrone d'extraction de mots-clés.
+
+    Les méthodes à modèle passent par un `MicroBatcher` ; YAKE et TF-IDF
+    tournent dans un pool de threads séparé pour ne pas attendre les lots.
+    """
+
+    def __init__(self, max_batch_size=16, max_wait_ms=10, max_queue=256, cheap_workers=4):
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue = max_queue
+        self.cheap_executor = ThreadPoolExecutor(max_workers=cheap_workers, thread_name_prefix="cheap")
+        self.cheap_in_flight = {method: 0 for method in METHODS if method not in BATCH_METHODS}
+        self.batchers = {}
+        self.requests = Counter()
+        self.closing = False
+        self.active_requests = 0
+        self._shutdown = None
+
+    async def extract(self, text, method, top_n=10):
+        if method in self.batchers:
+            return await self.batchers[method].submit(text, top_n)
+        if self.cheap_in_flight[method] >= self.max_queue:
+            raise Overloaded(method)
+        self.cheap_in_flight[method] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.cheap_executor, extract_keywords, text, method, top_n
+            )
+        finally:
+            self.cheap_in_flight[method] -= 1
+
+    def metrics(self):
+        """Métriques du service (files d'attente, lots, requêtes) et des étapes, au format Prometheus."""
+        lines = [
+            "# HELP keyword_queue_depth Requêtes en attente par méthode.",
+            "# TYPE keyword_queue_depth gauge",
+        ]
+        for method, batcher in self.batchers.items():
+            lines.append(f'keyword_queue_depth{{method="{method}"}} {batcher.queue.qsize()}')
+        lines += ["# HELP keyword_in_flight Requêtes en cours de traitement par méthode.",
+                  "# TYPE keyword_in_flight gauge"]
+        for method, batcher in self.batchers.items():
+            lines.append(f'keyword_in_flight{{method="{method}"}} {batcher.in_flight}')
+        for method, count in self.cheap_in_flight.items():
+            lines.append(f'keyword_in_flight{{method="{method}"}} {count}')
+        lines += ["# HELP keyword_batches_total Lots d'inférence exécutés.",
+                  "# TYPE keyword_batches_total counter"]
+        for method, batcher in self.batchers.items():
+            lines.append(f'keyword_batches_total{{method="{method}"}} {batcher.batches}')
+        lines += ["# HELP keyword_batched_requests_total Requêtes traitées par lots.",
+                  "# TYPE keyword_batched_requests_total counter"]
+        for method, batcher in self.batchers.items():
+            lines.append(f'keyword_batched_requests_total{{method="{method}"}} {batcher.batched_requests}')
+        lines += ["# HELP keyword_requests_total Requêtes HTTP par méthode et par statut.",
+                  "# TYPE keyword_requests_total counter"]
+        for (method, status), count in sorted(self.requests.items()):
+            lines.append(f'keyword_requests_total{{method="{method}",status="{status}"}} {count}')
+        return "\n".join(lines) + "\n" + instrumentation.registry.to_prometheus()
+
+    async def route(self, verb, path, body):
+        """Retourne (statut, type de contenu, corps) pour une requête HTTP."""
+        path = path.split("?", 1)[0]
+        if path == "/health" and verb == "GET":
+            status = 503 if self.closing else 200
+            return status, "application/json", {"status": "closing" if self.closing else "ok"}
+        if path == "/metrics" and verb == "GET":
+            return 200, "text/plain; version=0.0.4", self.metrics()
+        if path != "/extract":
+            return 404, "application/json", {"error": "not found"}
+        if verb != "POST":
+            return 405, "application/json", {"error": "POST attendu"}
+        if self.closing:
+            return 503, "application/json", {"error": "arrêt en cours"}
+
+        try:
+            payload = json.loads(body)
+            text, method, top_n = payload["text"], payload.get("method", "YAKE"), int(payload.get("top_n", 10))
+            if not isinstance(text, str) or method not in METHODS or top_n <= 0:
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return 400, "application/json", {
+                "error": "corps attendu : {\"text\": ..., \"method\": ..., \"top_n\": ...}",
+                "methods": list(METHODS),
+            }
+
+        try:
+            keywords = await self.extract(text, method, top_n)
+            status, result = 200, {"method": method, "keywords": [[k, float(s)] for k, s in keywords]}
+        except Overloaded:
+            status, result = 503, {"error": f"file d'attente pleine pour {method}"}
+        except Exception as e:
+            status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        self.requests[(method, status)] += 1
+        return status, "application/json", result
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                verb, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_SIZE:
+                    status, content_type, result = 413, "application/json", {"error": "corps trop volumineux"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length)
+                    self.active_requests += 1
+                    try:
+                        status, content_type, result = await self.route(verb, path, body)
+                    finally:
+                        self.active_requests -= 1
+                    keep_alive = headers.get("connection", "").lower() != "close" and not self.closing
+
+                data = result.encode("utf-8") if isinstance(result, str) else json.dumps(result, ensure_ascii=False).encode("utf-8")
+                head = (f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                        f"Content-Type: {content_type}\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+                if status == 503:
+                    head += "Retry-After: 1\r\n"
+                writer.write(head.encode("latin-1") + b"\r\n" + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8000, preload=()):
+        """Démarre le serveur (et charge les modèles demandés) ; retourne le serveur asyncio."""
+        for method in BATCH_METHODS:
+            self.batchers[method] = MicroBatcher(method, self.max_batch_size, self.max_wait_ms, self.max_queue)
+            self.batchers[method].start()
+        loop = asyncio.get_running_loop()
+        for method in preload:
+            await loop.run_in_executor(None, load_method_models, method)
+        self._shutdown = asyncio.Event()
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def shutdown(self, server, timeout=30):
+        """Arrêt propre : refuse les nouvelles requêtes, termine celles en cours puis libère les pools."""
+        self.closing = True
+        server.close()
+        for batcher in self.batchers.values():
+            await batcher.close()
+        # Laisser aux requêtes en cours le temps d'envoyer leur réponse
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.active_requests and loop.time() < deadline:
+            await asyncio.sleep(0.01)
+        self.cheap_executor.shutdown(wait=True)
+
+    async def serve(self, host="127.0.0.1", port=8000, preload=()):
+        server = await self.start(host, port, preload)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._shutdown.set)
+        print(f"Service de mots-clés sur http://{host}:{port}")
+        await self._shutdown.wait()
+        await self.shutdown(server)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP d'extraction de mots-clés avec micro-lots.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--max-queue", type=int, default=256, help="Requêtes en attente au-delà desquelles le service répond 503")
+    parser.add_argument("--cheap-workers", type=int, default=4, help="Threads pour YAKE et TF-IDF")
+    parser.add_argument("--preload", nargs="*", default=[], choices=list(BATCH_METHODS),
+                        help="Méthodes dont les modèles sont chargés au démarrage")
+    args = parser.parse_args()
+
+    service = KeywordService(args.max_batch_size, args.max_wait_ms, args.max_queue, args.cheap_workers)
+    asyncio.run(service.serve(args.host, args.port, args.preload))
+
+
+if __name__ == "__main__":
+    main()
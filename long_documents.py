@@ -0,0 +1,232 @@
+import argparse
+import functools
+import json
+import os
+import sys
+
+from instrumentation import request, stage
+from keyword_extraction import KEYBERT_METHODS, METHODS, compute_preprocessed_batch, get_keybert, preprocess
+
+# Taille maximale des fenêtres (en mots après nettoyage) et recouvrement entre deux fenêtres consécutives.
+# Pour les méthodes KeyBERT, une fenêtre est en plus limitée au nombre de tokens accepté par le modèle
+# d'embedding (voir token_budget) ; YAKE, TF-IDF et les méthodes hybrides ne tronquent pas le texte
+# (AraBERT n'y score que des mots isolés).
+WINDOW_WORDS = int(os.environ.get("KEYWORD_WINDOW_WORDS", 256))
+WINDOW_OVERLAP = int(os.environ.get("KEYWORD_WINDOW_OVERLAP", 32))
+
+# Taille des blocs lus dans la source (en caractères)
+READ_CHUNK_CHARS = 64 * 1024
+
+# Méthodes dont le meilleur score est le plus petit
+LOWER_IS_BETTER = {"YAKE"}
+
+# Constante de la fusion par rangs réciproques
+RRF_K = 60
+
+
+def read_chunks(source, chunk_chars=READ_CHUNK_CHARS):
+    """Découpe la source (texte ou fichier ouvert) en blocs qui ne coupent aucun mot."""
+    if isinstance(source, str):
+        pieces = (source[i:i + chunk_chars] for i in range(0, len(source), chunk_chars))
+    else:
+        pieces = iter(lambda: source.read(chunk_chars), "")
+
+    pending = ""
+    for piece in pieces:
+        pending += piece
+        # Conserver le dernier mot, peut-être incomplet, pour le bloc suivant
+        cut = max(pending.rfind(" "), pending.rfind("\n"), pending.rfind("\t"))
+        if cut < 0:
+            continue
+        yield pending[:cut]
+        pending = pending[cut + 1:]
+    if pending:
+        yield pending
+
+
+def iter_windows(source, window_words=WINDOW_WORDS, overlap=WINDOW_OVERLAP, chunk_chars=READ_CHUNK_CHARS,
+                 count_tokens=None, max_tokens=None):
+    """Produit les fenêtres glissantes (textes prétraités) d'un document long.
+
+    Une fenêtre contient au plus `window_words` mots et, si `count_tokens`
+    (nombre de tokens d'un mot) est fourni, au plus `max_tokens` tokens.
+    Chaque bloc lu est prétraité puis ajouté à un tampon de mots ; seul ce
+    tampon (au plus une fenêtre et un bloc) est gardé en mémoire.
+    """
+    if not 0 <= overlap < window_words:
+        raise ValueError("Le recouvrement doit être positif et inférieur à la taille des fenêtres")
+
+    words, tokens, total_tokens = [], [], 0
+    covered = 0  # Mots du début du tampon déjà couverts par une fenêtre
+    for chunk in read_chunks(source, chunk_chars):
+        for word in preprocess(chunk).split():
+            word_tokens = count_tokens(word) if count_tokens else 0
+            if words and (len(words) == window_words or
+                          (count_tokens and total_tokens + word_tokens > max_tokens)):
+                yield " ".join(words)
+                # Recouvrement, en gardant au moins un mot nouveau par fenêtre et la place du mot suivant
+                start = len(words) - min(overlap, len(words) - 1)
+                del words[:start], tokens[:start]
+                total_tokens = sum(tokens)
+                while words and count_tokens and total_tokens + word_tokens > max_tokens:
+                    total_tokens -= tokens.pop(0)
+                    words.pop(0)
+                covered = len(words)
+            words.append(word)
+            tokens.append(word_tokens)
+            total_tokens += word_tokens
+    if len(words) > covered:
+        yield " ".join(words)
+
+
+def token_budget(method):
+    """Retourne (compteur de tokens d'un mot, tokens maximum par fenêtre) pour les méthodes KeyBERT.
+
+    Le modèle d'embedding tronque les documents au-delà de `max_seq_length`
+    tokens (128 pour DistilBERT). Retourne (None, None) pour les autres méthodes.
+    """
+    for name, label in KEYBERT_METHODS.items():
+        if label == method:
+            embedding_model = get_keybert(name).model.embedding_model
+            tokenizer = embedding_model.tokenizer
+
+            @functools.lru_cache(maxsize=100000)
+            def count_tokens(word):
+                return len(tokenizer.tokenize(word))
+
+            # max_seq_length comprend les tokens spéciaux ([CLS], [SEP]...)
+            return count_tokens, embedding_model.max_seq_length - tokenizer.num_special_tokens_to_add()
+    return None, None
+
+
+class ScoreAggregator:
+    """Combine les mots-clés des fenêtres en mots-clés du document.
+
+    Règles disponibles :
+    - "max" : meilleur score obtenu dans une fenêtre ;
+    - "mean" : moyenne des scores sur les fenêtres où le mot apparaît ;
+    - "frequency" : nombre de fenêtres où le mot apparaît (égalités départagées par le meilleur score) ;
+    - "rrf" : somme de 1 / (60 + rang) sur les fenêtres, qui favorise les mots bien classés et récurrents.
+
+    "max" et "mean" gardent l'échelle et le sens de la méthode (pour YAKE,
+    plus petit est meilleur) ; "frequency" et "rrf" donnent des scores où
+    plus grand est meilleur. Au-delà de `max_candidates` mots, les moins
+    bien classés sont abandonnés afin de borner la mémoire.
+    """
+
+    RULES = ("max", "mean", "frequency", "rrf")
+
+    def __init__(self, rule="max", lower_is_better=False, max_candidates=10000):
+        if rule not in self.RULES:
+            raise ValueError(f"Règle d'agrégation inconnue : {rule}")
+        self.rule = rule
+        self.lower_is_better = lower_is_better
+        self.max_candidates = max_candidates
+        self.windows = 0
+        # mot -> [meilleur score, somme des scores, nombre de fenêtres, somme des rangs réciproques]
+        self.entries = {}
+
+    def add(self, keywords):
+        """Ajoute les mots-clés d'une fenêtre, triés du meilleur au moins bon."""
+        self.windows += 1
+        for rank, (keyword, score) in enumerate(keywords, 1):
+            score = float(score)
+            entry = self.entries.get(keyword)
+            if entry is None:
+                self.entries[keyword] = [score, score, 1, 1 / (RRF_K + rank)]
+                continue
+            if (score < entry[0]) if self.lower_is_better else (score > entry[0]):
+                entry[0] = score
+            entry[1] += score
+            entry[2] += 1
+            entry[3] += 1 / (RRF_K + rank)
+        if len(self.entries) > 2 * self.max_candidates:
+            self.entries = dict(self._ranked()[:self.max_candidates])
+
+    def _score(self, entry):
+        if self.rule == "max":
+            return entry[0]
+        if self.rule == "mean":
+            return entry[1] / entry[2]
+        if self.rule == "frequency":
+            return entry[2]
+        return entry[3]
+
+    def _ranked(self):
+        if self.rule in ("max", "mean"):
+            sign = 1 if self.lower_is_better else -1
+            key = lambda item: sign * self._score(item[1])
+        else:
+            best = 1 if self.lower_is_better else -1
+            key = lambda item: (-self._score(item[1]), best * item[1][0])
+        return sorted(self.entries.items(), key=key)
+
+    def result(self, top_n=10):
+        """Retourne les `top_n` mots-clés du document, du meilleur au moins bon."""
+        return [(keyword, self._score(entry)) for keyword, entry in self._ranked()[:top_n]]
+
+
+def extract_long_document(source, method, top_n=10, aggregation="max", window_words=WINDOW_WORDS,
+                          overlap=WINDOW_OVERLAP, batch_windows=16, window_top_n=None):
+    """Extrait les mots-clés d'un document long (texte ou fichier ouvert) par fenêtres glissantes.
+
+    Les fenêtres sont traitées par lots de `batch_windows` (une seule
+    inférence par lot pour les méthodes à modèle) et leurs `window_top_n`
+    meilleurs mots-clés sont combinés selon `aggregation`. Pour les méthodes
+    KeyBERT, les fenêtres tiennent dans la longueur maximale du modèle. La mémoire
+    utilisée dépend de la taille des fenêtres et des lots, pas de celle du
+    document.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method}")
+    aggregator = ScoreAggregator(aggregation, lower_is_better=method in LOWER_IS_BETTER)
+    window_top_n = window_top_n or top_n
+
+    with request(method):
+        count_tokens, max_tokens = token_budget(method)
+        batch = []
+        for window in iter_windows(source, window_words, overlap, count_tokens=count_tokens, max_tokens=max_tokens):
+            batch.append(window)
+            if len(batch) == batch_windows:
+                _aggregate(aggregator, batch, method, window_top_n)
+                batch = []
+        if batch:
+            _aggregate(aggregator, batch, method, window_top_n)
+        return aggregator.result(top_n)
+
+
+def _aggregate(aggregator, windows, method, top_n):
+    # Pas de cache de résultats : les fenêtres d'un document ne se répètent pas et rempliraient le cache
+    results = compute_preprocessed_batch(windows, method, top_n=top_n)
+    with stage("window_aggregation"):
+        for keywords in results:
+            aggregator.add(keywords)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction de mots-clés d'un document long par fenêtres glissantes.")
+    parser.add_argument("input", help="Fichier texte (UTF-8), ou - pour l'entrée standard")
+    parser.add_argument("--method", required=True, choices=list(METHODS))
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--aggregation", default="max", choices=ScoreAggregator.RULES)
+    parser.add_argument("--window-words", type=int, default=WINDOW_WORDS)
+    parser.add_argument("--overlap", type=int, default=WINDOW_OVERLAP)
+    parser.add_argument("--batch-windows", type=int, default=16, help="Fenêtres traitées par lot")
+    parser.add_argument("--window-top-n", type=int, default=None,
+                        help="Mots-clés retenus par fenêtre (par défaut : --top-n)")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        keywords = extract_long_document(source, args.method, top_n=args.top_n, aggregation=args.aggregation,
+                                         window_words=args.window_words, overlap=args.overlap,
+                                         batch_windows=args.batch_windows, window_top_n=args.window_top_n)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    json.dump([[keyword, float(score)] for keyword, score in keywords], sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import os
+import threading
+from collections import OrderedDict
+
+from instrumentation import stage
+
+
+def estimate_model_memory(obj, _depth=0):
+    """Estime la mémoire (en octets) occupée par les poids d'un modèle."""
+    if obj is None or _depth > 4:
+        return 0
+    if isinstance(obj, (tuple, list)):
+        return sum(estimate_model_memory(item, _depth + 1) for item in obj)
+
+    # Modules PyTorch : paramètres + buffers
+    if callable(getattr(obj, "parameters", None)):
+        total = sum(p.numel() * p.element_size() for p in obj.parameters())
+        if callable(getattr(obj, "buffers", None)):
+            total += sum(b.numel() * b.element_size() for b in obj.buffers())
+        return total
+
+    # KeyBERT -> backend -> SentenceTransformer
+    for attribute in ("model", "embedding_model"):
+        inner = getattr(obj, attribute, None)
+        if inner is not None and inner is not obj:
+            size = estimate_model_memory(inner, _depth + 1)
+            if size:
+                return size
+    return 0
+
+
+class ModelRegistry:
+    """Registre de modèles partagé par le processus.
+
+    Chaque modèle est chargé à la première utilisation puis réutilisé.
+    Lorsque la mémoire estimée dépasse le budget, les modèles les moins
+    récemment utilisés sont évincés.
+    """
+
+    def __init__(self, max_memory_mb=None):
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+        self._loaders = {}
+        self._models = OrderedDict()  # nom -> (modèle, taille en octets)
+        self._lock = threading.RLock()
+        self._load_locks = {}  # nom -> verrou de chargement propre au modèle
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def register(self, name, loader):
+        """Enregistre une fonction de chargement pour le modèle `name`."""
+        with self._lock:
+            self._loaders[name] = loader
+
+    def get(self, name):
+        """Retourne le modèle `name`, en le chargeant si nécessaire.
+
+        Le chargement a lieu hors du verrou global : seuls les appels qui
+        attendent ce même modèle sont bloqués, les autres modèles restent
+        disponibles pendant ce temps.
+        """
+        with self._lock:
+            model = self._hit(name)
+            if model is not None:
+                return model
+            if name not in self._loaders:
+                raise KeyError(f"Modèle inconnu : {name}")
+            loader = self._loaders[name]
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            # Le modèle a pu être chargé par un autre thread pendant l'attente
+            with self._lock:
+                model = self._hit(name)
+                if model is not None:
+                    return model
+
+            with stage("model_load"):
+                model = loader()
+            size = estimate_model_memory(model)
+
+            with self._lock:
+                self._models[name] = (model, size)
+                self.loads += 1
+                self._evict_over_budget(keep=name)
+            return model
+
+    def _hit(self, name):
+        entry = self._models.get(name)
+        if entry is None:
+            return None
+        self._models.move_to_end(name)
+        self.hits += 1
+        return entry[0]
+
+    def evict(self, name):
+        """Décharge le modèle `name` s'il est chargé."""
+        with self._lock:
+            if self._models.pop(name, None) is not None:
+                self.evictions += 1
+
+    def clear(self):
+        """Décharge tous les modèles."""
+        with self._lock:
+            self.evictions += len(self._models)
+            self._models.clear()
+
+    def memory_usage(self):
+        """Mémoire estimée (en octets) des modèles chargés."""
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def stats(self):
+        """Retourne les compteurs de chargement, de réutilisation et d'éviction."""
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "loaded": list(self._models),
+                "memory_mb": round(self.memory_usage() / (1024 * 1024), 1),
+                "max_memory_mb": (
+                    round(self.max_memory_bytes / (1024 * 1024), 1)
+                    if self.max_memory_bytes else None
+                ),
+            }
+
+    def _evict_over_budget(self, keep):
+        if self.max_memory_bytes is None:
+            return
+        while self.memory_usage() > self.max_memory_bytes and len(self._models) > 1:
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                break
+            del self._models[oldest]
+            self.evictions += 1
+
+
+# Budget mémoire configurable par variable d'environnement (en Mo, illimité par défaut)
+model_registry = ModelRegistry(
+    max_memory_mb=float(os.environ.get("KEYWORD_MODELS_MAX_MEMORY_MB", 0)) or None
+)
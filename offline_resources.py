@@ -0,0 +1,130 @@
+import argparse
+import os
+import sys
+import zipfile
+
+# Liste précompilée des stopwords arabes de NLTK (un mot par ligne), livrée avec le code et
+# régénérée par `python offline_resources.py stopwords`
+STOPWORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "arabic_stopwords.txt")
+
+# Répertoire local des modèles : un sous-répertoire par modèle (ex. aubmindlab--bert-base-arabert),
+# produit par `python offline_resources.py models`
+MODELS_DIR = os.environ.get("KEYWORD_MODELS_DIR")
+
+# Mode hors ligne : transformers et huggingface_hub lisent uniquement leur cache local
+if os.environ.get("KEYWORD_OFFLINE", "0") == "1":
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+
+def nltk_data_dirs():
+    """Répertoires où NLTK cherche ses données (comme nltk.data.path), sans importer nltk."""
+    dirs = [d for d in os.environ.get("NLTK_DATA", "").split(os.pathsep) if d]
+    dirs.append(os.path.expanduser(os.path.join("~", "nltk_data")))
+    dirs += [os.path.join(sys.prefix, *parts) for parts in (("nltk_data",), ("share", "nltk_data"), ("lib", "nltk_data"))]
+    dirs += ["/usr/share/nltk_data", "/usr/local/share/nltk_data", "/usr/lib/nltk_data", "/usr/local/lib/nltk_data"]
+    return dirs
+
+
+def read_nltk_stopwords(language="arabic"):
+    """Lit une liste de stopwords dans les données NLTK installées (répertoire ou archive), ou retourne None.
+
+    nltk n'est pas importé : il charge scikit-learn et scipy, ce qui coûterait
+    plus d'une seconde au démarrage.
+    """
+    for directory in nltk_data_dirs():
+        path = os.path.join(directory, "corpora", "stopwords", language)
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                return [line.strip() for line in f if line.strip()]
+        archive = os.path.join(directory, "corpora", "stopwords.zip")
+        if os.path.isfile(archive):
+            with zipfile.ZipFile(archive) as z:
+                if f"stopwords/{language}" in z.namelist():
+                    text = z.read(f"stopwords/{language}").decode("utf-8")
+                    return [line.strip() for line in text.splitlines() if line.strip()]
+    return None
+
+
+def load_arabic_stopwords(path=STOPWORDS_PATH):
+    """Retourne les stopwords arabes de NLTK sans rien télécharger ni importer nltk.
+
+    La liste est lue depuis le fichier livré avec le code ; à défaut, depuis
+    les données NLTK déjà installées. Sans l'un ni l'autre, l'import échoue :
+    les résultats changeraient sans les stopwords (في, من, على deviendraient
+    des mots-clés).
+    """
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    words = read_nltk_stopwords("arabic")
+    if words is None:
+        raise FileNotFoundError(
+            f"Stopwords arabes introuvables : ni {path} ni données NLTK (corpora/stopwords). "
+            f"Générez {path} avec `python offline_resources.py stopwords`."
+        )
+    return words
+
+
+def build_stopwords(path=STOPWORDS_PATH):
+    """Télécharge les stopwords de NLTK et écrit la liste précompilée."""
+    import nltk
+    nltk.download("stopwords", quiet=True)
+    from nltk.corpus import stopwords
+
+    words = stopwords.words("arabic")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(words) + "\n")
+    return len(words)
+
+
+def local_model_dir(model_id, models_dir=None):
+    return os.path.join(models_dir or MODELS_DIR, model_id.replace("/", "--"))
+
+
+def model_path(model_id):
+    """Chemin local du modèle s'il a été copié dans KEYWORD_MODELS_DIR, sinon son identifiant."""
+    if MODELS_DIR:
+        path = local_model_dir(model_id)
+        if os.path.isdir(path):
+            return path
+    return model_id
+
+
+def download_models(models_dir, arabert_models=(), sentence_models=()):
+    """Copie les modèles dans `models_dir` pour une utilisation hors ligne."""
+    for model_id in arabert_models:
+        from transformers import AutoModel, AutoTokenizer
+        target = local_model_dir(model_id, models_dir)
+        AutoTokenizer.from_pretrained(model_id).save_pretrained(target)
+        AutoModel.from_pretrained(model_id).save_pretrained(target)
+        print(f"{model_id} -> {target}")
+    for model_id in sentence_models:
+        from sentence_transformers import SentenceTransformer
+        target = local_model_dir(model_id, models_dir)
+        SentenceTransformer(model_id, device="cpu").save(target)
+        print(f"{model_id} -> {target}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prépare les ressources nécessaires à un démarrage hors ligne.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stopwords_parser = subparsers.add_parser("stopwords", help="Précompile la liste de stopwords arabes de NLTK")
+    stopwords_parser.add_argument("--output", default=STOPWORDS_PATH)
+    models_parser = subparsers.add_parser("models", help="Copie les modèles AraBERT et KeyBERT dans un répertoire local")
+    models_parser.add_argument("models_dir", nargs="?", default=MODELS_DIR)
+    args = parser.parse_args()
+
+    if args.command == "stopwords":
+        print(f"{build_stopwords(args.output)} stopwords -> {args.output}")
+    else:
+        if not args.models_dir:
+            parser.error("répertoire des modèles requis (argument ou KEYWORD_MODELS_DIR)")
+        from keyword_extraction import ARABERT_MODEL, KEYBERT_MODELS
+        download_models(args.models_dir, [ARABERT_MODEL], KEYBERT_MODELS.values())
+
+
+if __name__ == "__main__":
+    main()
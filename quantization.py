@@ -0,0 +1,157 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from importlib import metadata
+
+from offline_resources import model_path
+
+PRECISIONS = ("fp32", "int8")
+
+# Répertoire où sont conservés les modèles quantifiés après la première conversion
+QUANTIZED_CACHE_DIR = os.environ.get(
+    "KEYWORD_QUANTIZED_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "keyword_project", "quantized"),
+)
+
+
+def quantize_dynamic_int8(model):
+    """Quantifie dynamiquement en int8 les couches linéaires d'un modèle, pour l'inférence sur CPU."""
+    import torch
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _hub_revision(model_id):
+    """Commit du modèle dans le cache local de huggingface_hub, s'il y a été téléchargé."""
+    hub_cache = os.environ.get("HF_HUB_CACHE") or os.path.join(
+        os.environ.get("HF_HOME", os.path.join(os.path.expanduser("~"), ".cache", "huggingface")), "hub"
+    )
+    ref_path = os.path.join(hub_cache, f"models--{model_id.replace('/', '--')}", "refs", "main")
+    if os.path.exists(ref_path):
+        with open(ref_path, encoding="utf-8") as f:
+            return f.read().strip()
+    return None
+
+
+def source_fingerprint(model_id):
+    """Identifie les poids fp32 utilisés : fichiers du répertoire local (taille, date), sinon révision du hub."""
+    source = model_path(model_id)
+    if not os.path.isdir(source):
+        return {"model": model_id, "revision": _hub_revision(model_id)}
+    files = []
+    for root, _, names in os.walk(source):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files.append([os.path.relpath(path, source), stat.st_size, stat.st_mtime_ns])
+    return {"model": model_id, "path": os.path.abspath(source), "files": sorted(files)}
+
+
+def quantized_cache_path(model_id, cache_dir=QUANTIZED_CACHE_DIR):
+    """Chemin des poids quantifiés : la clé change avec les poids fp32 et les versions de torch et transformers."""
+    key = json.dumps({
+        "source": source_fingerprint(model_id),
+        "versions": {name: _package_version(name) for name in ("torch", "transformers", "sentence-transformers")},
+    }, sort_keys=True)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{model_id.replace('/', '--')}-int8-{digest}.pt")
+
+
+def load_quantized(model_id, load_fp32, cache_dir=QUANTIZED_CACHE_DIR):
+    """Retourne le modèle `model_id` quantifié en int8.
+
+    Seul le state_dict quantifié est conservé dans `cache_dir` : il est
+    relu avec `weights_only=True` (aucun code n'est exécuté au chargement)
+    dans l'architecture fp32 quantifiée par `quantize_dynamic`. Un fichier
+    illisible est simplement régénéré.
+    """
+    import torch
+    model = quantize_dynamic_int8(load_fp32())
+    path = quantized_cache_path(model_id, cache_dir)
+    if os.path.exists(path):
+        try:
+            model.load_state_dict(torch.load(path, weights_only=True))
+            return model
+        except Exception:
+            pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    torch.save(model.state_dict(), tmp_path)
+    os.replace(tmp_path, path)
+    return model
+
+
+def load_quantized_sentence_transformer(model_id, cache_dir=QUANTIZED_CACHE_DIR):
+    """Modèle SentenceTransformer quantifié, utilisable comme modèle KeyBERT."""
+    from sentence_transformers import SentenceTransformer
+    return load_quantized(model_id, lambda: SentenceTransformer(model_path(model_id), device="cpu"), cache_dir)
+
+
+def keyword_overlap(reference, candidate):
+    """Part des mots-clés de référence retrouvés dans `candidate`."""
+    reference_words = {keyword for keyword, _ in reference}
+    if not reference_words:
+        return 1.0
+    return len(reference_words & {keyword for keyword, _ in candidate}) / len(reference_words)
+
+
+def accuracy_report(methods, top_n=10):
+    """Compare les mots-clés et la latence en fp32 et en int8 sur les textes prédéfinis."""
+    from keyword_extraction import METHODS, preprocess, set_method_precision
+    from sample_texts import texts
+
+    documents = {topic: preprocess(text) for topic, text in texts.items()}
+    report = {}
+    for method in methods:
+        keywords, latencies = {}, {}
+        for precision in PRECISIONS:
+            set_method_precision(method, precision)
+            METHODS[method](next(iter(documents.values())), top_n=top_n)  # Chargement / conversion du modèle
+            start = time.perf_counter()
+            keywords[precision] = {topic: METHODS[method](text, top_n=top_n) for topic, text in documents.items()}
+            latencies[precision] = (time.perf_counter() - start) * 1000 / len(documents)
+        set_method_precision(method, "fp32")
+
+        overlaps = {topic: keyword_overlap(keywords["fp32"][topic], keywords["int8"][topic]) for topic in documents}
+        report[method] = {
+            "mean_overlap": sum(overlaps.values()) / len(overlaps),
+            "min_overlap": min(overlaps.values()),
+            "overlap_by_topic": overlaps,
+            "fp32_ms_per_text": latencies["fp32"],
+            "int8_ms_per_text": latencies["int8"],
+            "speedup": latencies["fp32"] / latencies["int8"] if latencies["int8"] else None,
+        }
+    return report
+
+
+def main():
+    from keyword_extraction import METHOD_MODELS
+
+    parser = argparse.ArgumentParser(description="Rapport de précision fp32 / int8 sur les textes prédéfinis.")
+    parser.add_argument("--methods", nargs="+", default=list(METHOD_MODELS), choices=list(METHOD_MODELS))
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--output", default="quantization_report.json")
+    args = parser.parse_args()
+
+    report = accuracy_report(args.methods, top_n=args.top_n)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'Méthode':<26} {'Recouvrement':>12} {'Minimum':>8} {'fp32 ms':>9} {'int8 ms':>9} {'Gain':>6}")
+    for method, result in report.items():
+        print(f"{method:<26} {result['mean_overlap']:>12.0%} {result['min_overlap']:>8.0%} "
+              f"{result['fp32_ms_per_text']:>9.1f} {result['int8_ms_per_text']:>9.1f} {result['speedup'] or 0:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
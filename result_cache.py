@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResultCache:
+    """Cache persistant des mots-clés, adressé par le contenu du texte nettoyé.
+
+    Les résultats sont stockés dans une base SQLite en mode WAL, qui peut être
+    lue et écrite simultanément par plusieurs processus. Les entrées expirent
+    après `ttl` secondes, et au-delà de `max_entries` les plus anciennes sont
+    supprimées.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=None, evict_every=100):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, keywords TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)")
+
+    def _connection(self):
+        # Une connexion par thread et par processus (les connexions ne survivent pas à un fork)
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @staticmethod
+    def make_key(cleaned_text, method, top_n, model_version=""):
+        """Clé du cache : empreinte du texte nettoyé, de la méthode, de top_n et de la version du modèle."""
+        payload = "\x1f".join([cleaned_text, method, str(top_n), model_version])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Retourne les mots-clés en cache pour `key`, ou None."""
+        row = self._connection().execute(
+            "SELECT keywords, created_at FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [tuple(pair) for pair in json.loads(row[0])]
+
+    def put(self, key, keywords):
+        """Enregistre les mots-clés calculés pour `key`."""
+        data = json.dumps([[keyword, float(score)] for keyword, score in keywords], ensure_ascii=False)
+        self._connection().execute(
+            "INSERT OR REPLACE INTO results (key, keywords, created_at) VALUES (?, ?, ?)",
+            (key, data, time.time()),
+        )
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self.evict()
+
+    def evict(self):
+        """Supprime les entrées expirées puis les plus anciennes au-delà de `max_entries`."""
+        connection = self._connection()
+        if self.ttl is not None:
+            connection.execute("DELETE FROM results WHERE created_at < ?", (time.time() - self.ttl,))
+        if self.max_entries is not None:
+            connection.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self):
+        """Compteurs du processus courant et nombre d'entrées stockées."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
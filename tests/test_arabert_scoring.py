@@ -0,0 +1,107 @@
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import batch_extract
+from arabert_scoring import WordScoreCache
+
+MODEL = "aubmindlab/bert-base-arabert"
+
+
+def fill(path, words):
+    """Remplit un cache dans un processus du pool, qui ne passe pas par atexit."""
+    cache = WordScoreCache(path=path, model_name=MODEL, save_every=1)
+    for i, word in enumerate(words):
+        cache.put(word, float(i))
+
+
+def test_processes_sharing_a_file_keep_each_others_scores(tmp_path):
+    path = str(tmp_path / "scores.json")
+    groups = [[f"{letter}{i}" for i in range(20)] for letter in "abcd"]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(fill, [path] * len(groups), groups))
+
+    cache = WordScoreCache(path=path, model_name=MODEL)
+    assert len(cache) == 80
+
+
+def test_scores_are_saved_every_n_new_words(tmp_path):
+    path = str(tmp_path / "scores.json")
+    cache = WordScoreCache(path=path, model_name=MODEL, save_every=3)
+    cache.put("كتاب", 1.0)
+    cache.put("كتاب", 1.0)
+    cache.put("قلم", 2.0)
+    assert len(WordScoreCache(path=path, model_name=MODEL)) == 0
+    cache.put("بيت", 3.0)
+    assert len(WordScoreCache(path=path, model_name=MODEL)) == 3
+
+
+def test_memory_scores_win_over_the_file(tmp_path):
+    path = str(tmp_path / "scores.json")
+    old = WordScoreCache(path=path, model_name=MODEL)
+    old.put("كتاب", 1.0)
+    old.save()
+    new = WordScoreCache(path=path, model_name=MODEL)
+    new.put("كتاب", 5.0)
+    new.put("قلم", 2.0)
+    new.save()
+    assert WordScoreCache(path=path, model_name=MODEL).get("كتاب") == 5.0
+
+
+def test_batch_workers_flush_caches(monkeypatch):
+    flushes = []
+    monkeypatch.setattr(batch_extract, "flush_caches", lambda: flushes.append(True))
+    batch_extract.process_documents("TF-IDF", 3, [("a", "الكتاب مفيد")])
+    assert flushes
+
+
+class StubTokenizer:
+    """Un identifiant par caractère ; les lots sont complétés par des zéros et masqués."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, words, return_tensors, truncation, padding, max_length):
+        import torch
+        self.batches.append(list(words))
+        length = max(len(word) for word in words) + 1
+        ids = [[1] + [ord(char) % 97 + 2 for char in word] for word in words]
+        return {
+            "input_ids": torch.tensor([row + [0] * (length - len(row)) for row in ids]),
+            "attention_mask": torch.tensor([[1] * len(row) + [0] * (length - len(row)) for row in ids]),
+        }
+
+
+class StubModel:
+    """Comme BERT avec le masque d'attention : l'état [CLS] ne dépend que des tokens réels."""
+
+    def __call__(self, input_ids, attention_mask):
+        import torch
+        torch.manual_seed(0)
+        embeddings = torch.randn(100, 4)
+        masked = embeddings[input_ids] * attention_mask.unsqueeze(-1)
+        cls = masked.sum(dim=1, keepdim=True).tanh()
+        return types.SimpleNamespace(last_hidden_state=torch.cat([cls, masked], dim=1))
+
+
+def test_batched_scores_match_per_word_scores_and_use_the_cache():
+    pytest.importorskip("torch")
+    from arabert_scoring import ArabertScorer
+
+    words = ["كتاب", "قلم", "المدرسة", "كتاب", "أساس", "الأساسية"]
+    tokenizer = StubTokenizer()
+    scorer = ArabertScorer(lambda: (tokenizer, StubModel()), batch_size=4)
+    batched = scorer.score(words)
+
+    single = {}
+    for word in set(words):
+        single.update(ArabertScorer(lambda: (StubTokenizer(), StubModel()), batch_size=1).score([word]))
+    assert batched == pytest.approx(single)
+    # Mots dédupliqués avant le passage dans le modèle
+    assert sorted(word for batch in tokenizer.batches for word in batch) == sorted(set(words))
+
+    tokenizer.batches.clear()
+    documents = scorer.score_documents([["كتاب", "بيت"], ["قلم", "بيت"]])
+    assert tokenizer.batches == [["بيت"]]
+    assert documents[0]["كتاب"] == batched["كتاب"] and documents[0]["بيت"] == documents[1]["بيت"]
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+import keyword_extraction as ke
+from arabic_normalizer import ArabicNormalizer
+
+# Lettres arabes, diacritiques, ponctuation, chiffres (latins, arabes, persans), lettres latines et espaces
+ALPHABET = (
+    [chr(c) for c in range(0x0621, 0x064B)]
+    + [chr(c) for c in range(0x064B, 0x0660)]
+    + list('،.؟!:-(){}[];"\'~@#$%^&*_+/«»')
+    + [chr(c) for c in range(0x0660, 0x066A)] + [chr(c) for c in range(0x06F0, 0x06FA)] + list("0123456789")
+    + list("abcXYZéà")
+    + [" ", " ", " ", "\t", "\n", " "]
+)
+STOPWORDS = ["في", "من", "على", "هذه", "الذي", "abc"]
+
+
+def old_clean(text):
+    """Enchaînement d'origine des étapes de nettoyage (expressions régulières)."""
+    text = ke.remove_foreign_words(text)
+    text = ke.remove_diacritics(text)
+    text = ke.remove_punctuation_and_symbols(text)
+    text = ke.remove_numbers_and_symbols(text)
+    return ke.remove_multiple_spaces(text)
+
+
+def old_remove_stopwords(text, arabic_stopwords, custom_stopwords):
+    return ' '.join(word for word in text.split() if word not in arabic_stopwords and word not in custom_stopwords)
+
+
+def random_texts(seed, count=3000):
+    rng = random.Random(seed)
+    for _ in range(count):
+        pieces = []
+        for _ in range(rng.randint(0, 12)):
+            if rng.random() < 0.2:
+                pieces.append(rng.choice(STOPWORDS))
+            else:
+                pieces.append(''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 8))))
+        yield rng.choice([" ", "", "\n"]).join(pieces)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_normalizer_matches_the_regex_chain(seed):
+    normalizer = ArabicNormalizer(set(STOPWORDS[:3]) | set(STOPWORDS[3:]))
+    texts = list(random_texts(seed))
+    expected = [old_remove_stopwords(old_clean(text), STOPWORDS[:3], STOPWORDS[3:]) for text in texts]
+
+    assert [normalizer.clean(text) for text in texts] == [old_clean(text) for text in texts]
+    assert [normalizer.normalize(text) for text in texts] == expected
+    assert normalizer.normalize_batch(texts) == expected
+
+
+def test_preprocess_matches_the_regex_chain():
+    for text in random_texts(42, count=1000):
+        assert ke.preprocess(text) == old_remove_stopwords(old_clean(text), ke.arabic_stopwords, ke.custom_stopwords)
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import batch_extract
+from batch_extract import extract_stream, read_documents
+
+
+def test_malformed_records_give_per_document_errors(tmp_path):
+    path = tmp_path / "articles.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"id": "a", "text": "الكتاب مفيد جدا"}, ensure_ascii=False),
+        "{pas du json",
+        json.dumps({"id": "c", "titre": "sans texte"}),
+        "[1, 2]",
+        json.dumps({"id": "e", "text": "القلم جديد"}, ensure_ascii=False),
+    ]), encoding="utf-8")
+
+    results = list(extract_stream(read_documents([str(path)]), "TF-IDF", top_n=3, workers=0))
+
+    assert [result["id"] for result in results] == ["a", f"{path}:2", "c", f"{path}:4", "e"]
+    assert [("error" in result) for result in results] == [False, True, True, True, False]
+    assert results[1]["error"].startswith("JSONDecodeError")
+    assert "text" in results[2]["error"]
+    assert results[4]["keywords"]
+
+
+def test_model_methods_process_each_chunk_as_one_batch(monkeypatch):
+    batches = []
+
+    def extract_batch(texts, method, top_n=10):
+        batches.append(list(texts))
+        return [[(text.split()[0], 1.0)] for text in texts]
+
+    monkeypatch.setattr(batch_extract, "extract_keywords_batch", extract_batch)
+    monkeypatch.setattr(batch_extract, "extract_keywords", lambda *args, **kwargs: pytest.fail("extraction par document"))
+    documents = [("a", "كتاب جديد"), ("b", ValueError("champ 'text' absent ou non textuel")), ("c", "قلم أحمر")]
+
+    results = batch_extract.process_documents("TF-IDF + AraBERT", 3, documents)
+
+    assert batches == [["كتاب جديد", "قلم أحمر"]]
+    assert results[0] == {"id": "a", "method": "TF-IDF + AraBERT", "keywords": [["كتاب", 1.0]]}
+    assert results[1]["error"].startswith("ValueError")
+    assert results[2]["keywords"] == [["قلم", 1.0]]
+
+
+def test_failed_batch_is_retried_per_document(monkeypatch):
+    def extract_batch(texts, method, top_n=10):
+        raise RuntimeError("lot en échec")
+
+    def extract(text, method, top_n=10):
+        if text == "hello":
+            raise ValueError("empty vocabulary")
+        return [(text, 1.0)]
+
+    monkeypatch.setattr(batch_extract, "extract_keywords_batch", extract_batch)
+    monkeypatch.setattr(batch_extract, "extract_keywords", extract)
+
+    results = batch_extract.process_documents("KeyBERT + AraBERT", 3, [("a", "كتاب"), ("b", "hello"), ("c", "قلم")])
+
+    assert [result.get("keywords") for result in results] == [[["كتاب", 1.0]], None, [["قلم", 1.0]]]
+    assert results[1]["error"] == "ValueError: empty vocabulary"
@@ -0,0 +1,32 @@
+import types
+
+import benchmark
+from arabert_scoring import WordScoreCache
+
+
+def test_word_caches_are_emptied_and_their_hit_rate_reported():
+    scorers = [types.SimpleNamespace(cache=WordScoreCache()) for _ in range(2)]
+    assert benchmark.word_cache_hit_rate(scorers) is None
+
+    scorers[0].cache.put("كتاب", 1.0)
+    scorers[0].cache.get("كتاب")
+    scorers[1].cache.get("قلم")
+    assert benchmark.word_cache_hit_rate(scorers) == 0.5
+
+    benchmark.reset_word_caches(scorers)
+    assert scorers[0].cache.get("كتاب") is None
+    assert benchmark.word_cache_hit_rate(scorers) == 0.0
+
+
+def test_workers_ignore_persisted_caches(monkeypatch):
+    seen = {}
+
+    def fake_run(command, env, **kwargs):
+        seen.update(env)
+        return types.SimpleNamespace(returncode=0, stdout='{"method": "TF-IDF"}\n', stderr="")
+
+    monkeypatch.setenv("KEYWORD_ARABERT_CACHE", "/tmp/scores.json")
+    monkeypatch.setenv("KEYWORD_RESULT_CACHE", "/tmp/results.sqlite")
+    monkeypatch.setattr(benchmark.subprocess, "run", fake_run)
+    benchmark.run_in_subprocess("TF-IDF", ["sujets"], 10, 0)
+    assert "KEYWORD_ARABERT_CACHE" not in seen and "KEYWORD_RESULT_CACHE" not in seen
@@ -0,0 +1,107 @@
+import pytest
+
+from hybrid_pipeline import (ArabertStage, HybridMethod, TfidfStage, YakeStage, make_documents, normalized_fusion,
+                             sum_fusion)
+
+TFIDF = {
+    "التعليم أساس تقدم الأمم": [("التعليم", 0.6), ("أساس", 0.5), ("تقدم", 0.4), ("الأمم", 0.3)],
+    "الطالب يقرأ الكتاب": [("الطالب", 0.7), ("الكتاب", 0.6), ("يقرأ", 0.2)],
+}
+YAKE = {
+    "التعليم أساس تقدم الأمم": [("تقدم", 0.05), ("التعليم", 0.1), ("الأمم", 0.3)],
+    "الطالب يقرأ الكتاب": [("الكتاب", 0.02), ("الطالب", 0.2)],
+}
+ARABERT = {"التعليم": 0.01, "أساس": -0.02, "تقدم": 0.03, "الأمم": 0.0, "الطالب": 0.04, "الكتاب": -0.01, "يقرأ": 0.02}
+
+
+class Calls:
+    def __init__(self, scores=None):
+        self.scores = scores
+        self.calls = []
+
+    def tfidf(self, corpus, top_n):
+        self.calls.append(("tfidf", corpus[0]))
+        return sorted(self.scores[corpus[0]], key=lambda x: x[1], reverse=True)[:top_n]
+
+    def yake(self, text, top_n):
+        self.calls.append(("yake", text))
+        return self.scores[text][:top_n]
+
+
+class StubScorer:
+    def __init__(self):
+        self.words = []
+
+    def score_documents(self, documents_words):
+        self.words.extend(word for words in documents_words for word in words)
+        return [{word: ARABERT[word] for word in words} for words in documents_words]
+
+
+def old_tfidf_yake_arabert(text, tfidf_keywords, yake_keywords, top_n):
+    """Combinaison d'origine : score YAKE du premier mot-clé qui contient le mot (recherche de sous-chaîne)."""
+    combined = {}
+    for word, tfidf_score in tfidf_keywords:
+        yake_score = next((score for keyword, score in yake_keywords if word in keyword), 0)
+        combined[word] = tfidf_score + yake_score + ARABERT.get(word, 0)
+    return sorted(combined.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+
+def build(tfidf, yake, scorer, fusion=sum_fusion):
+    return HybridMethod(TfidfStage(tfidf), [YakeStage(yake), ArabertStage(scorer)], fusion)
+
+
+def test_sum_fusion_matches_the_original_combination_on_exact_matches():
+    tfidf, yake = Calls(TFIDF), Calls(YAKE)
+    method = build(tfidf.tfidf, yake.yake, StubScorer())
+    texts = list(TFIDF)
+
+    results = method.extract(texts, top_n=3)
+
+    # Mêmes entrées que l'ancien code : calculate_tfidf et extract_with_yake limités à top_n
+    assert results == [
+        old_tfidf_yake_arabert(text, Calls(TFIDF).tfidf([text], 3), Calls(YAKE).yake(text, 3), 3) for text in texts
+    ]
+
+
+def test_yake_scores_use_exact_words_instead_of_substrings():
+    text = "أساس المبادئ الأساسية"
+    tfidf = Calls({text: [("أساس", 0.5), ("المبادئ", 0.4)]})
+    yake = Calls({text: [("الأساسية", 0.05), ("المبادئ", 0.2)]})
+    method = HybridMethod(TfidfStage(tfidf.tfidf), [YakeStage(yake.yake)])
+
+    (result,) = method.extract([text], top_n=2)
+
+    # 'أساس' est une sous-chaîne de 'الأساسية' : l'ancienne recherche lui attribuait le score YAKE de ce mot
+    assert dict(result) == {"أساس": 0.5, "المبادئ": pytest.approx(0.6)}
+    old = dict((word, score - ARABERT.get(word, 0))
+               for word, score in old_tfidf_yake_arabert(text, tfidf.scores[text], yake.scores[text], 2))
+    assert old["أساس"] == pytest.approx(0.55)
+
+
+def test_normalized_fusion_favours_lower_yake_scores():
+    text = "كتاب قلم"
+    tfidf = Calls({text: [("كتاب", 0.5), ("قلم", 0.5)]})
+    yake = Calls({text: [("قلم", 0.01), ("كتاب", 0.9)]})
+    method = HybridMethod(TfidfStage(tfidf.tfidf), [YakeStage(yake.yake)], normalized_fusion())
+
+    (result,) = method.extract([text], top_n=2)
+
+    assert result == [("قلم", 2.0), ("كتاب", 1.0)]
+
+
+def test_stages_run_once_per_document():
+    tfidf, yake, scorer = Calls(TFIDF), Calls(YAKE), StubScorer()
+    tfidf_stage, yake_stage, arabert_stage = TfidfStage(tfidf.tfidf), YakeStage(yake.yake), ArabertStage(scorer)
+    tfidf_arabert = HybridMethod(tfidf_stage, [arabert_stage])
+    tfidf_yake_arabert = HybridMethod(tfidf_stage, [yake_stage, arabert_stage])
+    documents = make_documents(list(TFIDF))
+
+    first = tfidf_arabert.extract_documents(documents, top_n=3)
+    tfidf_yake_arabert.extract_documents(documents, top_n=3)
+    again = tfidf_arabert.extract_documents(documents, top_n=3)
+
+    assert first == again
+    assert sorted(tfidf.calls) == sorted(("tfidf", text) for text in TFIDF)
+    assert sorted(yake.calls) == sorted(("yake", text) for text in TFIDF)
+    # Les mots déjà scorés par AraBERT pour un document ne sont pas envoyés une seconde fois
+    assert sorted(scorer.words) == sorted(word for text in TFIDF for word, _ in tfidf.tfidf([text], 3))
@@ -0,0 +1,24 @@
+import threading
+import time
+
+import instrumentation
+
+
+def test_stage_cpu_time_includes_other_threads():
+    instrumentation.configure(enabled=True)
+    instrumentation.registry.reset()
+    try:
+        def spin():
+            end = time.perf_counter() + 0.2
+            while time.perf_counter() < end:
+                pass
+
+        with instrumentation.stage("inference"):
+            # Comme torch : le calcul tourne sur un autre thread pendant que l'étape attend
+            worker = threading.Thread(target=spin)
+            worker.start()
+            worker.join()
+        assert instrumentation.registry.cpu[("inference", "")] >= 0.1
+    finally:
+        instrumentation.configure(enabled=False)
+        instrumentation.registry.reset()
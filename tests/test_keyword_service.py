@@ -0,0 +1,195 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import keyword_extraction
+import keyword_service
+from keyword_service import KeywordService
+
+METHOD = "KeyBERT + AraBERT"
+
+
+class StubKeyBERT:
+    """Imite KeyBERT : [] si aucun document n'a de vocabulaire, liste à plat pour un seul document."""
+
+    def extract_keywords(self, documents, top_n=10):
+        keywords = [[(word, 1.0 / (rank + 1)) for rank, word in enumerate(document.split()[:top_n])]
+                    for document in documents]
+        if not any(keywords):
+            return []
+        return keywords[0] if len(documents) == 1 else keywords
+
+
+@pytest.fixture
+def stub_keybert(monkeypatch):
+    monkeypatch.setattr(keyword_extraction, "get_keybert", lambda name: StubKeyBERT())
+
+
+@pytest.fixture
+def batch_calls(monkeypatch):
+    """Remplace l'extraction par lots par une extraction factice qui enregistre la taille des lots."""
+    calls = []
+
+    def extract(texts, method, top_n=10):
+        calls.append(len(texts))
+        time.sleep(0.05)
+        return [[("كلمة", 1.0)] for _ in texts]
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_batch", extract)
+    return calls
+
+
+async def request(port, verb="POST", path="/extract", payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(f"{verb} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, content = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), head.decode("latin-1"), json.loads(content)
+
+
+def run(scenario):
+    """Exécute un scénario ; un résultat de lot perdu ferait sinon attendre la requête indéfiniment."""
+    return asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+
+
+async def start(service):
+    server = await service.start(port=0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_concurrent_requests_are_micro_batched(batch_calls):
+    async def scenario():
+        service = KeywordService(max_batch_size=8, max_wait_ms=50)
+        server, port = await start(service)
+        responses = await asyncio.gather(*[
+            request(port, payload={"text": f"نص {i}", "method": METHOD}) for i in range(20)
+        ])
+        await service.shutdown(server)
+        return responses, service
+
+    responses, service = run(scenario)
+    assert [status for status, _, _ in responses] == [200] * 20
+    assert sum(batch_calls) == 20
+    assert max(batch_calls) <= 8
+    assert len(batch_calls) < 20
+    assert service.batchers[METHOD].batched_requests == 20
+
+
+def test_full_queue_answers_503(monkeypatch):
+    release = threading.Event()
+
+    def blocked(texts, method, top_n=10):
+        release.wait(5)
+        return [[] for _ in texts]
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_batch", blocked)
+
+    async def scenario():
+        service = KeywordService(max_batch_size=1, max_wait_ms=0, max_queue=2)
+        server, port = await start(service)
+        tasks = [asyncio.create_task(request(port, payload={"text": "نص", "method": METHOD})) for _ in range(6)]
+        await asyncio.sleep(0.3)
+        release.set()
+        responses = await asyncio.gather(*tasks)
+        await service.shutdown(server)
+        return responses
+
+    responses = run(scenario)
+    statuses = [status for status, _, _ in responses]
+    assert 503 in statuses and 200 in statuses
+    assert all("Retry-After: 1" in head for status, head, _ in responses if status == 503)
+
+
+def test_text_without_vocabulary_returns_empty_keywords(stub_keybert):
+    assert keyword_extraction.extract_keywords_batch(["hello world"], METHOD) == [[]]
+    assert keyword_extraction.extract_keywords_batch(["hello", "كتاب قلم"], METHOD) == [[], [("كتاب", 1.0), ("قلم", 0.5)]]
+
+    async def scenario():
+        service = KeywordService()
+        server, port = await start(service)
+        response = await request(port, payload={"text": "hello", "method": METHOD})
+        await service.shutdown(server)
+        return response
+
+    status, _, body = run(scenario)
+    assert status == 200
+    assert body == {"method": METHOD, "keywords": []}
+
+
+def test_mismatched_batch_result_is_an_error(monkeypatch):
+    monkeypatch.setattr(keyword_service, "extract_keywords_batch", lambda texts, method, top_n=10: [])
+
+    async def scenario():
+        service = KeywordService()
+        server, port = await start(service)
+        response = await request(port, payload={"text": "نص", "method": METHOD})
+        await service.shutdown(server)
+        return response
+
+    status, _, body = run(scenario)
+    assert status == 500
+    assert "0 résultats pour 1 textes" in body["error"]
+
+
+def test_failing_text_does_not_fail_its_batch(monkeypatch):
+    calls = []
+
+    def extract(texts, method, top_n=10):
+        calls.append(len(texts))
+        if "hello" in texts:
+            raise ValueError("empty vocabulary")
+        return [[(text, 1.0)] for text in texts]
+
+    monkeypatch.setattr(keyword_service, "extract_keywords_batch", extract)
+
+    async def scenario():
+        service = KeywordService(max_batch_size=8, max_wait_ms=50)
+        server, port = await start(service)
+        responses = await asyncio.gather(*[
+            request(port, payload={"text": text, "method": METHOD}) for text in ["نص", "hello", "كتاب", "قلم"]
+        ])
+        await service.shutdown(server)
+        return responses
+
+    responses = run(scenario)
+    assert [status for status, _, _ in responses] == [200, 500, 200, 200]
+    assert responses[2][2]["keywords"] == [["كتاب", 1.0]]
+    assert max(calls) > 1
+
+
+def test_hybrid_batch_with_a_text_without_vocabulary(monkeypatch):
+    for scorer in keyword_extraction.arabert_scorers.values():
+        monkeypatch.setattr(scorer, "score_documents",
+                            lambda documents_words, batch_size=None: [dict.fromkeys(words, 0.5) for words in documents_words])
+
+    results = keyword_extraction.extract_keywords_batch(["hello world", "التعليم هو أساس تقدم الأمم"], "TF-IDF + AraBERT")
+
+    assert len(results) == 2
+    assert results[0] == []
+    assert results[1]
+
+
+def test_shutdown_finishes_pending_requests(batch_calls):
+    async def scenario():
+        service = KeywordService(max_wait_ms=0)
+        server, port = await start(service)
+        pending = asyncio.create_task(request(port, payload={"text": "نص", "method": METHOD}))
+        await asyncio.sleep(0.02)
+        await service.shutdown(server)
+        response = await pending
+        health = await service.route("GET", "/health", b"")
+        refused = await service.route("POST", "/extract", b'{"text": "x"}')
+        with pytest.raises(OSError):
+            await request(port)
+        return response, health, refused, service
+
+    (status, _, body), health, refused, service = run(scenario)
+    assert status == 200 and body["keywords"] == [["كلمة", 1.0]]
+    assert health[0] == 503 and refused[0] == 503
+    assert all(batcher._task.done() for batcher in service.batchers.values())
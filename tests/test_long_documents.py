@@ -0,0 +1,75 @@
+import types
+
+import pytest
+
+import keyword_extraction
+import long_documents
+from long_documents import iter_windows
+
+WORDS = "كتاب قلم بيت شمس قمر نجم بحر".split()
+
+
+def test_word_windows_overlap_and_cover_the_document():
+    windows = list(iter_windows(" ".join(WORDS), window_words=3, overlap=1, chunk_chars=8))
+    assert windows == ["كتاب قلم بيت", "بيت شمس قمر", "قمر نجم بحر"]
+
+
+def test_token_windows_stay_under_the_token_limit():
+    windows = list(iter_windows(" ".join(WORDS), window_words=100, overlap=1,
+                                count_tokens=len, max_tokens=8))
+    assert all(sum(len(word) for word in window.split()) <= 8 for window in windows)
+    assert windows[0] == "كتاب قلم"
+    assert windows[-1].split()[-1] == "بحر"
+    assert set(" ".join(windows).split()) == set(WORDS)
+
+
+def test_overlap_must_be_smaller_than_windows():
+    with pytest.raises(ValueError):
+        list(iter_windows("كتاب", window_words=2, overlap=2))
+
+
+class StubTokenizer:
+    """Un token par lettre, plus deux tokens spéciaux par séquence."""
+
+    def tokenize(self, word):
+        return list(word)
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+
+class StubKeyBERT:
+    def __init__(self, documents):
+        self.documents = documents
+        embedding_model = types.SimpleNamespace(tokenizer=StubTokenizer(), max_seq_length=10)
+        self.model = types.SimpleNamespace(embedding_model=embedding_model)
+
+    def extract_keywords(self, documents, top_n=10):
+        self.documents.extend(documents)
+        return [[(word, 1.0) for word in document.split()[:top_n]] for document in documents]
+
+
+def test_keybert_windows_fit_the_model_length(monkeypatch):
+    documents = []
+    stub = StubKeyBERT(documents)
+    monkeypatch.setattr(keyword_extraction, "get_keybert", lambda name: stub)
+    monkeypatch.setattr(long_documents, "get_keybert", lambda name: stub)
+
+    keywords = long_documents.extract_long_document(" ".join(WORDS), "KeyBERT + AraBERT", top_n=20, overlap=1)
+
+    assert documents
+    assert all(sum(len(word) for word in document.split()) <= 8 for document in documents)
+    assert {keyword for keyword, _ in keywords} == set(WORDS)
+
+
+class FailingCache:
+    def get(self, key):
+        raise AssertionError("les fenêtres ne doivent pas passer par le cache de résultats")
+
+    put = get
+
+
+def test_windows_skip_the_result_cache(monkeypatch):
+    monkeypatch.setattr(keyword_extraction, "result_cache", FailingCache())
+    keywords = long_documents.extract_long_document(" ".join(WORDS * 3), "TF-IDF", top_n=3, window_words=4, overlap=1)
+    assert len(keywords) == 3
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from model_registry import ModelRegistry
+
+
+class FakeModel:
+    """Modèle factice dont la taille estimée est `size_mb` Mo."""
+
+    class Parameter:
+        def __init__(self, size):
+            self.size = size
+
+        def numel(self):
+            return self.size
+
+        def element_size(self):
+            return 1
+
+    def __init__(self, size_mb=1):
+        self._parameters = [self.Parameter(int(size_mb * 1024 * 1024))]
+
+    def parameters(self):
+        return self._parameters
+
+
+def test_model_is_loaded_once_and_reused():
+    registry = ModelRegistry()
+    calls = []
+    registry.register("a", lambda: calls.append(1) or FakeModel())
+    assert registry.get("a") is registry.get("a")
+    assert calls == [1]
+    assert registry.stats()["loads"] == 1 and registry.stats()["hits"] == 1
+
+
+def test_unknown_model_raises():
+    with pytest.raises(KeyError):
+        ModelRegistry().get("absent")
+
+
+def test_least_recently_used_model_is_evicted_over_budget():
+    registry = ModelRegistry(max_memory_mb=2.5)
+    for name in "abc":
+        registry.register(name, FakeModel)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+    assert registry.stats()["loaded"] == ["a", "c"]
+    assert registry.evictions == 1
+
+
+def test_loading_does_not_block_other_models():
+    registry = ModelRegistry()
+    started = threading.Event()
+
+    def slow_loader():
+        started.set()
+        time.sleep(1)
+        return FakeModel()
+
+    registry.register("fast", FakeModel)
+    registry.register("slow", slow_loader)
+    registry.get("fast")
+
+    loading = threading.Thread(target=registry.get, args=("slow",))
+    loading.start()
+    started.wait(5)
+    start = time.perf_counter()
+    registry.get("fast")
+    elapsed = time.perf_counter() - start
+    loading.join()
+    assert elapsed < 0.1
+
+
+def test_concurrent_requests_for_one_model_load_it_once():
+    registry = ModelRegistry()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return FakeModel()
+
+    registry.register("slow", slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert all(model is results[0] for model in results)
@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+import offline_resources
+from benchmark import HEAVY_MODULES, STARTUP_BUDGET_MS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Configuration réelle (liste de stopwords livrée, nltk installé) : l'import et le premier résultat
+# TF-IDF doivent tenir dans le budget de démarrage, sans charger nltk, torch ni scikit-learn
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import keyword_extraction
+import_ms = (time.perf_counter() - start) * 1000
+keywords = keyword_extraction.extract_keywords("يعتبر التعليم من أهم الركائز الأساسية في بناء المجتمعات", "TF-IDF", top_n=3)
+print(json.dumps({
+    "startup_ms": (time.perf_counter() - start) * 1000,
+    "import_ms": import_ms,
+    "keywords": [keyword for keyword, _ in keywords],
+    "modules": sorted(m for m in sys.modules if "." not in m),
+}))
+"""
+
+
+def run_startup(env=None):
+    completed = subprocess.run(
+        [sys.executable, "-W", "error", "-c", STARTUP_SCRIPT], cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, **(env or {})}, timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("env", [{}, {"KEYWORD_OFFLINE": "1"}])
+def test_startup_fits_the_budget_without_heavy_libraries(env):
+    result = run_startup(env)
+    assert len(result["keywords"]) == 3
+    assert not {"في", "من"} & set(result["keywords"])
+    assert not set(HEAVY_MODULES + ["nltk", "scipy"]) & set(result["modules"])
+    assert result["startup_ms"] < STARTUP_BUDGET_MS
+
+
+def test_reference_tfidf_model_does_not_import_sklearn(tmp_path):
+    from keyword_extraction import arabic_stopwords
+    from tfidf_engine import TfidfEngine
+
+    TfidfEngine(stop_words=arabic_stopwords).fit(["التعليم أساس تقدم الأمم", "الركائز الأساسية للمجتمعات"]).save(str(tmp_path))
+    result = run_startup({"KEYWORD_TFIDF_MODEL": str(tmp_path)})
+    assert len(result["keywords"]) == 3
+    assert not set(HEAVY_MODULES + ["scipy"]) & set(result["modules"])
+    assert result["startup_ms"] < STARTUP_BUDGET_MS
+
+
+def test_bundled_stopwords_are_used():
+    assert os.path.exists(offline_resources.STOPWORDS_PATH)
+    assert {"في", "من", "على", "هذه"} <= set(offline_resources.load_arabic_stopwords())
+
+
+def test_nltk_data_is_read_without_importing_nltk(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "nltk", None)
+    monkeypatch.setattr(offline_resources, "nltk_data_dirs", lambda: [str(tmp_path / "absent"), str(tmp_path)])
+    (tmp_path / "corpora").mkdir()
+    with zipfile.ZipFile(tmp_path / "corpora" / "stopwords.zip", "w") as z:
+        z.writestr("stopwords/arabic", "في\nمن\n")
+    assert offline_resources.load_arabic_stopwords(str(tmp_path / "absent.txt")) == ["في", "من"]
+
+    (tmp_path / "corpora" / "stopwords").mkdir()
+    (tmp_path / "corpora" / "stopwords" / "arabic").write_text("على\n", encoding="utf-8")
+    assert offline_resources.load_arabic_stopwords(str(tmp_path / "absent.txt")) == ["على"]
+
+
+def test_missing_stopwords_fail_loudly(tmp_path, monkeypatch):
+    monkeypatch.setattr(offline_resources, "nltk_data_dirs", lambda: [str(tmp_path)])
+    with pytest.raises(FileNotFoundError, match="offline_resources.py stopwords"):
+        offline_resources.load_arabic_stopwords(str(tmp_path / "absent.txt"))
+
+
+def test_precompiled_stopwords_are_read_first(tmp_path):
+    path = tmp_path / "arabic_stopwords.txt"
+    path.write_text("في\nمن\n\n", encoding="utf-8")
+    assert offline_resources.load_arabic_stopwords(str(path)) == ["في", "من"]
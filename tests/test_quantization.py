@@ -0,0 +1,56 @@
+import pytest
+
+import quantization
+
+MODEL = "aubmindlab/bert-base-arabert"
+
+
+@pytest.fixture
+def models_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "models"
+    (directory / MODEL.replace("/", "--")).mkdir(parents=True)
+    (directory / MODEL.replace("/", "--") / "model.safetensors").write_bytes(b"fp32")
+    monkeypatch.setattr(quantization, "model_path", lambda model_id: str(directory / model_id.replace("/", "--")))
+    return directory / MODEL.replace("/", "--")
+
+
+def test_cache_path_changes_with_the_checkpoint(models_dir, tmp_path):
+    path = quantization.quantized_cache_path(MODEL, str(tmp_path))
+    assert path == quantization.quantized_cache_path(MODEL, str(tmp_path))
+
+    (models_dir / "model.safetensors").write_bytes(b"other fp32 checkpoint")
+    assert quantization.quantized_cache_path(MODEL, str(tmp_path)) != path
+
+
+def test_cache_path_changes_with_library_versions(models_dir, tmp_path, monkeypatch):
+    path = quantization.quantized_cache_path(MODEL, str(tmp_path))
+    monkeypatch.setattr(quantization, "_package_version", lambda name: "99.0" if name == "torch" else None)
+    assert quantization.quantized_cache_path(MODEL, str(tmp_path)) != path
+
+
+def test_hub_models_are_keyed_by_revision(tmp_path, monkeypatch):
+    monkeypatch.setenv("HF_HUB_CACHE", str(tmp_path / "hub"))
+    refs = tmp_path / "hub" / f"models--{MODEL.replace('/', '--')}" / "refs"
+    refs.mkdir(parents=True)
+    (refs / "main").write_text("abc123", encoding="utf-8")
+    path = quantization.quantized_cache_path(MODEL, str(tmp_path))
+    (refs / "main").write_text("def456", encoding="utf-8")
+    assert quantization.quantized_cache_path(MODEL, str(tmp_path)) != path
+
+
+def test_quantized_state_dict_round_trip(tmp_path, models_dir):
+    torch = pytest.importorskip("torch")
+
+    def load_fp32():
+        torch.manual_seed(0)
+        return torch.nn.Sequential(torch.nn.Linear(8, 4), torch.nn.ReLU(), torch.nn.Linear(4, 2))
+
+    first = quantization.load_quantized(MODEL, load_fp32, str(tmp_path))
+    cached = list(tmp_path.glob("*-int8-*.pt"))
+    assert len(cached) == 1
+    second = quantization.load_quantized(MODEL, load_fp32, str(tmp_path))
+
+    inputs = torch.randn(3, 8)
+    assert torch.equal(first(inputs), second(inputs))
+    # Seul le state_dict est sauvegardé : il se relit sans exécuter de code
+    assert isinstance(torch.load(cached[0], weights_only=True), dict)
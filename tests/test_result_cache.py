@@ -0,0 +1,99 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import result_cache
+from result_cache import ResultCache
+
+KEYWORDS = [("التعليم", 0.5), ("المجتمع", 0.25)]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "time", clock.time)
+    return clock
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    assert cache.get("absent") is None
+    cache.put("key", KEYWORDS)
+    assert cache.get("key") == KEYWORDS
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), ttl=60)
+    cache.put("key", KEYWORDS)
+    clock.now += 59
+    assert cache.get("key") == KEYWORDS
+    clock.now += 2
+    assert cache.get("key") is None
+    cache.evict()
+    assert len(cache) == 0
+
+
+def test_evict_keeps_the_newest_max_entries(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_entries=3, evict_every=1000)
+    for i in range(5):
+        clock.now += 1
+        cache.put(f"key{i}", KEYWORDS)
+    assert len(cache) == 5
+    cache.evict()
+    assert len(cache) == 3
+    assert [cache.get(f"key{i}") is not None for i in range(5)] == [False, False, True, True, True]
+
+
+def test_eviction_runs_every_n_writes(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_entries=2, evict_every=4)
+    for i in range(3):
+        clock.now += 1
+        cache.put(f"key{i}", KEYWORDS)
+    assert len(cache) == 3
+    clock.now += 1
+    cache.put("key3", KEYWORDS)
+    assert len(cache) == 2
+
+
+def test_key_depends_on_text_method_top_n_and_version():
+    key = ResultCache.make_key("التعليم أساس", "TF-IDF", 10, "v1")
+    assert key == ResultCache.make_key("التعليم أساس", "TF-IDF", 10, "v1")
+    variants = [
+        ResultCache.make_key("التعليم", "TF-IDF", 10, "v1"),
+        ResultCache.make_key("التعليم أساس", "YAKE", 10, "v1"),
+        ResultCache.make_key("التعليم أساس", "TF-IDF", 5, "v1"),
+        ResultCache.make_key("التعليم أساس", "TF-IDF", 10, "v2"),
+        # Le séparateur empêche deux découpages différents de donner la même clé
+        ResultCache.make_key("التعليم أساس", "TF-IDF", 1, "0v1"),
+    ]
+    assert key not in variants
+    assert len(set(variants)) == len(variants)
+
+
+def write_and_read(path, worker, count):
+    """Écrit des entrées dans le cache partagé puis relit celles de tous les processus."""
+    cache = ResultCache(path)
+    for i in range(count):
+        cache.put(f"{worker}:{i}", [(f"كلمة{worker}", float(i))])
+    return sum(cache.get(f"{other}:{i}") is not None for other in range(4) for i in range(count))
+
+
+def test_processes_share_the_same_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    ResultCache(path)
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        seen = list(executor.map(write_and_read, [path] * 4, range(4), [50] * 4))
+
+    cache = ResultCache(path)
+    assert len(cache) == 200
+    assert all(count >= 50 for count in seen)
+    assert cache.get("3:49") == [("كلمة3", 49.0)]
@@ -0,0 +1,135 @@
+import random
+
+import numpy as np
+import pytest
+
+from tfidf_engine import tfidf_keywords
+
+sklearn_text = pytest.importorskip("sklearn.feature_extraction.text")
+
+# Petit vocabulaire (mots arabes, latins, chiffres, mots d'une lettre) pour provoquer des égalités de fréquence
+VOCABULARY = ["كتاب", "قلم", "بيت", "شمس", "قمر", "مدرسة", "الطالب", "في", "من", "و", "Data", "data", "2024", "x"]
+STOPWORDS = ["في", "من", "data"]
+
+
+def random_corpus(rng):
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 30))) + rng.choice(["", ".", " ،"])
+            for _ in range(rng.randint(1, 5))]
+
+
+def sklearn_keywords(corpus, stop_words, max_features):
+    vectorizer = sklearn_text.TfidfVectorizer(stop_words=stop_words, max_features=max_features)
+    scores = vectorizer.fit_transform(corpus).toarray()[0]
+    return list(zip(vectorizer.get_feature_names_out(), scores))
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_tfidf_keywords_match_sklearn(seed):
+    rng = random.Random(seed)
+    corpus = random_corpus(rng)
+    stop_words = rng.choice([None, STOPWORDS])
+    max_features = rng.choice([None, 1, 3, 5, 20])
+
+    try:
+        expected = sklearn_keywords(corpus, stop_words, max_features)
+    except ValueError:
+        with pytest.raises(ValueError):
+            tfidf_keywords(corpus, stop_words=stop_words, max_features=max_features)
+        return
+    result = tfidf_keywords(corpus, stop_words=stop_words, max_features=max_features)
+
+    assert [term for term, _ in result] == [str(term) for term, _ in expected]
+    assert [score for _, score in result] == pytest.approx([score for _, score in expected], abs=1e-12)
+    # Même ordre après le tri par score décroissant de calculate_tfidf
+    ranked = sorted(result, key=lambda x: x[1], reverse=True)
+    assert [term for term, _ in ranked] == [term for term, _ in sorted(expected, key=lambda x: x[1], reverse=True)]
+
+
+def test_empty_vocabulary_raises_like_sklearn():
+    with pytest.raises(ValueError):
+        sklearn_keywords(["في من"], STOPWORDS, None)
+    with pytest.raises(ValueError):
+        tfidf_keywords(["في من"], stop_words=STOPWORDS)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_murmurhash_matches_sklearn(seed):
+    from sklearn.utils import murmurhash3_32 as sklearn_murmurhash
+    from tfidf_engine import murmurhash3_32
+
+    rng = random.Random(seed)
+    terms = ["", "a", "ab", "abc", "abcd", "abcde"] + [
+        "".join(rng.choice(VOCABULARY[rng.randrange(len(VOCABULARY))]) for _ in range(rng.randint(1, 12)))
+        for _ in range(500)
+    ]
+    assert [murmurhash3_32(term) for term in terms] == [sklearn_murmurhash(term, positive=True) for term in terms]
+
+
+def engine_corpora():
+    rng = random.Random(7)
+    corpus = [corpus for _ in range(4) for corpus in random_corpus(rng)]
+    return corpus[:len(corpus) // 2], corpus[len(corpus) // 2:]
+
+
+def test_partial_fit_matches_a_single_fit_and_sklearn_idf():
+    from tfidf_engine import TfidfEngine
+
+    first, second = engine_corpora()
+    incremental = TfidfEngine(stop_words=STOPWORDS).fit(first).partial_fit(second)
+    single = TfidfEngine(stop_words=STOPWORDS).fit(first + second)
+
+    assert incremental.n_documents_ == single.n_documents_ == len(first + second)
+    assert sorted(incremental.terms_) == sorted(single.terms_)
+    incremental_idf = dict(zip(incremental.terms_, incremental.idf_))
+    single_idf = dict(zip(single.terms_, single.idf_))
+    assert incremental_idf == pytest.approx(single_idf, abs=1e-12)
+
+    vectorizer = sklearn_text.TfidfVectorizer(stop_words=STOPWORDS).fit(first + second)
+    assert incremental_idf == pytest.approx(dict(zip(vectorizer.get_feature_names_out(), vectorizer.idf_)), abs=1e-12)
+
+
+def test_save_and_load_round_trip_through_mmap(tmp_path):
+    from tfidf_engine import TfidfEngine
+
+    first, second = engine_corpora()
+    engine = TfidfEngine(stop_words=STOPWORDS).fit(first)
+    engine.save(str(tmp_path))
+
+    loaded = TfidfEngine.load(str(tmp_path))
+    assert isinstance(loaded.document_frequency_, np.memmap)
+    assert loaded.top_keywords(second, 5) == engine.top_keywords(second, 5)
+
+    # partial_fit après chargement : le modèle en mémoire est mis à jour, le fichier mappé reste intact
+    loaded.partial_fit(second)
+    expected = TfidfEngine(stop_words=STOPWORDS).fit(first + second)
+    assert loaded.n_documents_ == expected.n_documents_
+    assert dict(zip(loaded.terms_, loaded.idf_)) == pytest.approx(dict(zip(expected.terms_, expected.idf_)))
+    assert TfidfEngine.load(str(tmp_path)).n_documents_ == len(first)
+    assert list(TfidfEngine.load(str(tmp_path)).document_frequency_) == list(engine.document_frequency_)
+
+
+def test_hashing_mode_has_constant_size_and_same_keywords_without_collisions():
+    from tfidf_engine import TfidfEngine
+
+    first, second = engine_corpora()
+    hashed = TfidfEngine(stop_words=STOPWORDS, n_features=2 ** 20).fit(first).partial_fit(second)
+    vocabulary = TfidfEngine(stop_words=STOPWORDS).fit(first + second)
+
+    assert len(hashed.document_frequency_) == 2 ** 20
+    assert hashed.vocabulary_ is None
+    documents = first[:5] + second[:5]
+    # Tous les termes de chaque document : seul l'ordre des égalités (par colonne) diffère entre les deux modes
+    for hashed_keywords, keywords in zip(hashed.top_keywords(documents, 50), vocabulary.top_keywords(documents, 50)):
+        assert dict(hashed_keywords) == pytest.approx(dict(keywords), abs=1e-12)
+
+
+@pytest.mark.parametrize("n_features", [None, 64])
+def test_empty_or_unknown_documents_have_no_keywords(n_features):
+    from tfidf_engine import TfidfEngine
+
+    engine = TfidfEngine(stop_words=STOPWORDS, n_features=n_features).fit(["كتاب قلم", "بيت شمس"])
+    results = engine.top_keywords(["", "في من", "كتاب"], 5)
+    assert results[0] == [] and results[1] == []
+    assert [term for term, _ in results[2]] == ["كتاب"]
+    if n_features is None:
+        assert engine.top_keywords(["مدرسة جديدة"], 5) == [[]]
@@ -0,0 +1,276 @@
+import argparse
+import functools
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+# Découpage en mots par défaut de scikit-learn (token_pattern)
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+@functools.lru_cache(maxsize=100000)
+def murmurhash3_32(term, seed=0):
+    """MurmurHash3 32 bits (non signé) du terme encodé en UTF-8, comme sklearn.utils.murmurhash3_32(positive=True).
+
+    Les modèles hachés déjà sauvegardés gardent ainsi les mêmes colonnes,
+    sans importer scikit-learn.
+    """
+    data = term.encode("utf-8")
+    c1, c2, mask = 0xCC9E2D51, 0x1B873593, 0xFFFFFFFF
+    h = seed
+    rounded = len(data) & ~3
+    for i in range(0, rounded, 4):
+        k = (int.from_bytes(data[i:i + 4], "little") * c1) & mask
+        k = (((k << 15) | (k >> 17)) * c2) & mask
+        h ^= k
+        h = (((h << 13) | (h >> 19)) * 5 + 0xE6546B64) & mask
+    if len(data) & 3:
+        k = (int.from_bytes(data[rounded:], "little") * c1) & mask
+        h ^= (((k << 15) | (k >> 17)) * c2) & mask
+    h ^= len(data)
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & mask
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & mask
+    return h ^ (h >> 16)
+
+
+def tfidf_keywords(corpus, stop_words=None, max_features=None):
+    """Scores TF-IDF du premier document de `corpus`, identiques à ceux de TfidfVectorizer.
+
+    Équivaut à TfidfVectorizer(stop_words=stop_words, max_features=max_features)
+    suivi de zip(get_feature_names_out(), fit_transform(corpus).toarray().flatten()),
+    sans importer scikit-learn (dont l'import coûte près d'une seconde).
+    Retourne les couples (terme, score) dans l'ordre alphabétique des termes.
+    """
+    stop_words = frozenset(stop_words or ())
+    documents = [Counter(term for term in TOKEN_PATTERN.findall(document.lower()) if term not in stop_words)
+                 for document in corpus]
+    terms = sorted(set().union(*documents))
+    if not terms:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+
+    index = {term: i for i, term in enumerate(terms)}
+    counts = np.zeros((len(documents), len(terms)), dtype=np.int64)
+    for row, document in enumerate(documents):
+        for term, count in document.items():
+            counts[row, index[term]] = count
+
+    if max_features is not None and len(terms) > max_features:
+        # Même sélection (et même départage des égalités) que scikit-learn
+        kept = np.sort((-counts.sum(axis=0)).argsort()[:max_features])
+        counts = counts[:, kept]
+        terms = [terms[i] for i in kept]
+
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    scores = counts[0] * idf
+    norm = np.sqrt(np.dot(scores, scores))
+    if norm:
+        scores = scores / norm
+    return list(zip(terms, scores))
+
+
+class TfidfEngine:
+    """Modèle TF-IDF ajusté sur un corpus de référence et mis à jour par lots.
+
+    Les fréquences documentaires sont conservées dans un tableau numpy qui
+    peut être sauvegardé puis rechargé en mémoire mappée. Les nouveaux
+    documents sont seulement transformés ; `partial_fit` met à jour les
+    statistiques sans réajustement complet. Avec `n_features`, le vocabulaire
+    est remplacé par un hachage des termes et la mémoire reste constante.
+    N'utilise que numpy : un worker TF-IDF n'importe pas scikit-learn.
+    """
+
+    def __init__(self, stop_words=None, n_features=None):
+        self.stop_words = list(stop_words) if stop_words else None
+        self.n_features = n_features
+        self._stop_words = frozenset(self.stop_words or ())
+        self._reset()
+
+    def _reset(self):
+        self.vocabulary_ = None if self.hashing else {}
+        self.terms_ = []
+        self.document_frequency_ = np.zeros(self.n_features or 0, dtype=np.int64)
+        self.n_documents_ = 0
+        self._idf = None
+
+    @property
+    def hashing(self):
+        return self.n_features is not None
+
+    def _analyzer(self, document):
+        """Même découpage en mots que le TfidfVectorizer utilisé jusqu'ici (voir tfidf_keywords)."""
+        stop_words = self._stop_words
+        return [term for term in TOKEN_PATTERN.findall(document.lower()) if term not in stop_words]
+
+    def _index(self, term, grow):
+        if self.hashing:
+            return murmurhash3_32(term) % self.n_features
+        index = self.vocabulary_.get(term)
+        if index is None and grow:
+            index = self.vocabulary_[term] = len(self.terms_)
+            self.terms_.append(term)
+        return index
+
+    def _count_matrix(self, documents, grow=False):
+        """Construit la matrice creuse des occurrences (tableaux CSR : indptr, indices, data) et les termes de chaque document."""
+        indptr, indices, data, documents_terms = [0], [], [], []
+        for document in documents:
+            counts, terms = {}, {}
+            for term in self._analyzer(document):
+                index = self._index(term, grow)
+                if index is None:
+                    continue
+                counts[index] = counts.get(index, 0) + 1
+                terms[index] = term
+            # Colonnes triées comme dans scipy : les égalités de score sont départagées par colonne
+            columns = sorted(counts)
+            indices.extend(columns)
+            data.extend(counts[column] for column in columns)
+            indptr.append(len(indices))
+            documents_terms.append(terms)
+
+        arrays = (np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64),
+                  np.asarray(data, dtype=np.float64))
+        return arrays, documents_terms
+
+    @property
+    def _n_columns(self):
+        return self.n_features if self.hashing else len(self.terms_)
+
+    def fit(self, documents):
+        """Ajuste le modèle sur un corpus de référence."""
+        self._reset()
+        return self.partial_fit(documents)
+
+    def partial_fit(self, documents):
+        """Met à jour les fréquences documentaires avec un nouveau lot."""
+        (indptr, indices, _), _ = self._count_matrix(documents, grow=True)
+        n_columns = self._n_columns
+        document_frequency = np.bincount(indices, minlength=n_columns)
+        if len(self.document_frequency_) < n_columns:
+            self.document_frequency_ = np.concatenate([
+                self.document_frequency_,
+                np.zeros(n_columns - len(self.document_frequency_), dtype=np.int64),
+            ])
+        self.document_frequency_ = self.document_frequency_ + document_frequency
+        self.n_documents_ += len(indptr) - 1
+        self._idf = None
+        return self
+
+    @property
+    def idf_(self):
+        """IDF lissé, calculé comme dans scikit-learn (smooth_idf=True)."""
+        if self._idf is None:
+            self._idf = np.log((1 + self.n_documents_) / (1 + self.document_frequency_)) + 1
+        return self._idf
+
+    def _tfidf(self, documents):
+        """Tableaux CSR des scores TF-IDF (normalisés L2 par document) et termes de chaque document."""
+        (indptr, indices, data), documents_terms = self._count_matrix(documents)
+        data *= self.idf_[indices]
+        row_lengths = np.diff(indptr)
+        rows = np.repeat(np.arange(len(row_lengths)), row_lengths)
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(row_lengths)))
+        norms[norms == 0] = 1.0
+        data /= norms[rows]
+        return (indptr, indices, data), documents_terms
+
+    def transform(self, documents):
+        """Retourne la matrice TF-IDF (scipy.sparse, normalisée L2) et les termes de chaque document."""
+        import scipy.sparse as sp
+        (indptr, indices, data), documents_terms = self._tfidf(documents)
+        tfidf = sp.csr_matrix((data, indices, indptr), shape=(len(documents), self._n_columns))
+        return tfidf, documents_terms
+
+    def top_keywords(self, documents, top_n=10):
+        """Retourne, pour chaque document, les `top_n` mots-clés triés par score décroissant."""
+        (indptr, all_indices, data), documents_terms = self._tfidf(documents)
+        results = []
+        for row, terms in enumerate(documents_terms):
+            start, end = indptr[row], indptr[row + 1]
+            scores, indices = data[start:end], all_indices[start:end]
+            if len(scores) > top_n:
+                best = np.argpartition(-scores, top_n)[:top_n]
+                scores, indices = scores[best], indices[best]
+            order = np.argsort(-scores, kind="stable")
+            results.append([(terms[indices[i]], float(scores[i])) for i in order])
+        return results
+
+    def save(self, path):
+        """Sauvegarde le modèle dans le répertoire `path`."""
+        os.makedirs(path, exist_ok=True)
+        # Écriture dans un fichier temporaire : le fichier existant peut être mappé en mémoire
+        frequency_path = os.path.join(path, "document_frequency.npy")
+        with open(f"{frequency_path}.tmp", "wb") as f:
+            np.save(f, np.asarray(self.document_frequency_))
+        os.replace(f"{frequency_path}.tmp", frequency_path)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "n_documents": self.n_documents_,
+                "n_features": self.n_features,
+                "stop_words": self.stop_words,
+            }, f, ensure_ascii=False)
+        if not self.hashing:
+            with open(os.path.join(path, "terms.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(self.terms_))
+
+    @classmethod
+    def load(cls, path):
+        """Charge un modèle sauvegardé ; les fréquences sont mappées en mémoire."""
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        engine = cls(stop_words=meta["stop_words"], n_features=meta["n_features"])
+        engine.n_documents_ = meta["n_documents"]
+        # Copie à l'écriture : partial_fit ne modifie jamais le fichier chargé
+        engine.document_frequency_ = np.load(os.path.join(path, "document_frequency.npy"), mmap_mode="c")
+        if not engine.hashing:
+            with open(os.path.join(path, "terms.txt"), encoding="utf-8") as f:
+                engine.terms_ = [term for term in f.read().split("\n") if term]
+            engine.vocabulary_ = {term: index for index, term in enumerate(engine.terms_)}
+        return engine
+
+
+def read_documents(path):
+    """Lit un document (déjà nettoyé) par ligne."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste ou met à jour le modèle TF-IDF de référence.")
+    parser.add_argument("command", choices=["fit", "update"])
+    parser.add_argument("corpus", help="Fichier texte, un document nettoyé par ligne")
+    parser.add_argument("model_dir", help="Répertoire du modèle")
+    parser.add_argument("--hashing", type=int, default=None, metavar="N_FEATURES",
+                        help="Utiliser un vocabulaire haché de N_FEATURES colonnes")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        from offline_resources import load_arabic_stopwords
+        engine = TfidfEngine(stop_words=load_arabic_stopwords(), n_features=args.hashing)
+    else:
+        engine = TfidfEngine.load(args.model_dir)
+
+    batch = []
+    for document in read_documents(args.corpus):
+        batch.append(document)
+        if len(batch) >= args.batch_size:
+            engine.partial_fit(batch)
+            batch = []
+    if batch:
+        engine.partial_fit(batch)
+    engine.save(args.model_dir)
+    print(f"{engine.n_documents_} documents, {len(engine.document_frequency_)} termes")
+
+
+if __name__ == "__main__":
+    main()